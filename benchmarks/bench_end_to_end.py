@@ -0,0 +1,159 @@
+# bench_end_to_end.py
+"""
+End-to-end benchmark on a synthetic C project (see generate_project.py); needs gcc.
+
+Measures Parser throughput (find_mutation_points and grouping by function), mutant generation
+(expand_mutations and apply_single_mutation), and a full MutationTester run with its build and
+test phases and total mutants per second. Results are saved as JSON together with the git
+revision and the project parameters, so two revisions can be compared side by side.
+
+Usage:
+    python benchmarks/bench_end_to_end.py [--files 4] [--functions 5] [--lines 10] [--ops 3] [--output result.json]
+    python benchmarks/bench_end_to_end.py --compare before.json after.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from parser import Parser
+from mutator import Mutator
+from config import MutationConfig
+from main import MutationTester
+from generate_project import generate_project
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def best_of(func, repeat: int):
+    """Run func repeat times; return its (last) result and the best time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def bench_parser(sources: List[str], repeat: int) -> dict:
+    def parse():
+        lines = points = 0
+        for source_code in sources:
+            mutation_points = Parser.find_mutation_points(source_code)
+            source_lines = source_code.splitlines()
+            Parser.group_mutation_points_by_function(mutation_points, source_lines)
+            lines += len(source_lines)
+            points += len(mutation_points)
+        return lines, points
+    (lines, points), seconds = best_of(parse, repeat)
+    return {'lines': lines, 'points': points, 'seconds': round(seconds, 6),
+            'lines_per_s': round(lines / seconds), 'points_per_s': round(points / seconds)}
+
+def bench_generation(sources: List[str], operators: str, repeat: int) -> dict:
+    operator_set = Mutator.load_operator_set(operators)
+    prepared = [(source_code, source_code.splitlines(), Parser.line_offsets(source_code),
+                 Parser.find_mutation_points(source_code)) for source_code in sources]
+
+    def generate():
+        mutants = 0
+        for source_code, source_lines, line_offsets, mutation_points in prepared:
+            for _, edit in Mutator.expand_mutations(source_lines, mutation_points, operator_set):
+                Mutator.apply_single_mutation(source_code, edit, line_offsets)
+                mutants += 1
+        return mutants
+    mutants, seconds = best_of(generate, repeat)
+    return {'mutants': mutants, 'seconds': round(seconds, 6), 'mutants_per_s': round(mutants / seconds)}
+
+def bench_run(src_dir: str, test_dir: str, operators: str, jobs: int) -> dict:
+    """A full run; the per-phase times come from the run's progress tracker."""
+    with tempfile.TemporaryDirectory() as mutants_dir:
+        config = MutationConfig(operators=operators, show_progress=False, jobs=jobs)
+        tester = MutationTester([src_dir], test_dir, mutants_dir, config)
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            tester.run()
+        seconds = time.perf_counter() - start
+    phases = config.progress.phase_seconds
+    return {'mutants': tester.total, 'killed': tester.killed, 'seconds': round(seconds, 3),
+            'build_s': round(phases['build'], 3), 'test_s': round(phases['test'], 3),
+            'mutants_per_s': round(tester.total / seconds, 3) if seconds > 0 else None}
+
+def flatten(result: dict) -> dict:
+    return {f"{section}.{key}": value for section in ('parser', 'generation', 'run')
+            for key, value in result.get(section, {}).items()}
+
+def compare(before_path: str, after_path: str):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    if before.get('params') != after.get('params'):
+        print(f"Warning: different project parameters: {before.get('params')} vs {after.get('params')}")
+    a, b = flatten(before), flatten(after)
+    print(f"{'metric':<28} {before.get('revision') or before_path:>14} {after.get('revision') or after_path:>14} {'change':>9}")
+    for key in a:
+        if key not in b:
+            continue
+        change = f"{(b[key] - a[key]) / a[key]:+.1%}" if isinstance(a[key], (int, float)) and a[key] else ""
+        print(f"{key:<28} {a[key]:>14} {b[key]:>14} {change:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark on a synthetic C project")
+    parser.add_argument('--files', type=int, default=4, help='Number of generated source files')
+    parser.add_argument('--functions', type=int, default=5, help='Functions per source file')
+    parser.add_argument('--lines', type=int, default=10, help='Statement lines per function')
+    parser.add_argument('--ops', type=int, default=3, help='Arithmetic operators per statement line')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed of the generator')
+    parser.add_argument('--operators', default='default', help="Operator set for generation and the run")
+    parser.add_argument('--jobs', type=int, default=1, help='Parallel mutants in the full run (--jobs of main.py)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions of the in-process phases (best time is reported)')
+    parser.add_argument('--no-run', action='store_true', help='Skip the full mutation run (no gcc needed beyond generation)')
+    parser.add_argument('--output', required=False, help='Save the results as JSON to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two saved result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # Survived mutants are logged as errors; keep the output to the results.
+    logging.disable(logging.CRITICAL)
+    params = {'files': args.files, 'functions': args.functions, 'lines': args.lines, 'ops': args.ops,
+              'seed': args.seed, 'operators': args.operators, 'jobs': args.jobs}
+    result = {'revision': git_revision(), 'params': params}
+    with tempfile.TemporaryDirectory() as project_dir:
+        src_dir, test_dir = generate_project(project_dir, args.files, args.functions, args.lines, args.ops, args.seed)
+        sources = []
+        for path in Parser.collect_c_cpp_files(src_dir):
+            with open(path, 'r', newline='') as f:
+                sources.append(f.read())
+
+        result['parser'] = bench_parser(sources, args.repeat)
+        result['generation'] = bench_generation(sources, args.operators, args.repeat)
+        if not args.no_run:
+            result['run'] = bench_run(src_dir, test_dir, args.operators, args.jobs)
+
+    for section in ('parser', 'generation', 'run'):
+        if section in result:
+            print(f"{section:<11} " + "  ".join(f"{key}={value}" for key, value in result[section].items()))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_materialize.py
+"""
+Microbenchmark: offset-based mutant materialization against the previous splitlines/join approach.
+
+Usage:
+    python benchmarks/bench_materialize.py [--lines 5000] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from parser import Parser
+from mutator import Mutator
+
+def apply_single_mutation_splitlines(source_code: str, mutation_point: Tuple[int, int, str]) -> str:
+    """The previous implementation: split the whole source and join it again per mutant."""
+    lines = source_code.splitlines()
+    idx, col, op = mutation_point
+    line = lines[idx]
+    if line[col:col+len(op)] == op and op in Mutator.MUTATION_OPERATORS_MAP:
+        lines[idx] = line[:col] + Mutator.MUTATION_OPERATORS_MAP[op] + line[col+len(op):]
+    return '\n'.join(lines)
+
+def make_source(num_lines: int, newline: str = '\n') -> str:
+    """Generate a C source with a mutation point on almost every line."""
+    body = [f"    r = r + a * {i} - (b / {i + 1});" for i in range(num_lines)]
+    return newline.join(["int f(int a, int b) {", "    int r = 0;"] + body + ["    return r;", "}", ""])
+
+def bench(label, func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {count:>7} mutants  {best:8.3f} s  {count / best:12.0f} mutants/s")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Mutant materialization microbenchmark")
+    parser.add_argument('--lines', type=int, default=5000, help='Number of generated source lines')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions (best time is reported)')
+    parser.add_argument('--mutants', type=int, default=2000, help='Number of mutants materialized')
+    args = parser.parse_args()
+
+    for newline in ('\n', '\r\n'):
+        source_code = make_source(args.lines, newline)
+        points = Parser.find_mutation_points(source_code)[:args.mutants]
+        line_offsets = Parser.line_offsets(source_code)
+
+        # Byte-exactness: only the mutated token may differ from the original.
+        for point in points:
+            mutant = Mutator.apply_single_mutation(source_code, point, line_offsets)
+            idx, col, op = point
+            offset = line_offsets[idx] + col
+            new_op = Mutator.MUTATION_OPERATORS_MAP[op]
+            assert mutant[:offset] == source_code[:offset]
+            assert mutant[offset + len(new_op):] == source_code[offset + len(op):]
+
+        print(f"Source: {args.lines} lines, {len(source_code)} chars, newline={newline!r}")
+        old = bench("splitlines/join (previous)", lambda: sum(1 for p in points if apply_single_mutation_splitlines(source_code, p)), args.repeat)
+        new = bench("offset table + slicing", lambda: sum(1 for p in points if Mutator.apply_single_mutation(source_code, p, line_offsets)), args.repeat)
+        print(f"Speedup: {old / new:.1f}x\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_records.py
+"""
+Memory benchmark: columnar RecordStore against a list of (mutant, test, result, source) tuples.
+
+Usage:
+    python benchmarks/bench_records.py [--mutants 20000] [--tests 50]
+"""
+
+import os
+import sys
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from record_store import RecordStore
+
+def make_records(num_mutants: int, num_tests: int, num_sources: int = 100):
+    """Yield full-matrix style records: every mutant against every test, with absolute paths built per record."""
+    for m in range(num_mutants):
+        source = f"/home/ci/project/src/module_{m % num_sources}/source_{m % num_sources}.c"
+        mutant = f"/home/ci/project/mutants_output/mutant_source_{m % num_sources}_function_{m}.c"
+        for t in range(num_tests):
+            yield (mutant, f"/home/ci/project/test/module_{m % num_sources}/test_source_{t}.c",
+                   "killed" if (m + t) % 3 else "survived", source)
+
+def measure(label, build, count):
+    tracemalloc.start()
+    records = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} {count:>9} records  {current / 2**20:9.1f} MiB  {current / count:7.1f} bytes/record")
+    return records, current
+
+def main():
+    parser = argparse.ArgumentParser(description="Mutant/test record store memory benchmark")
+    parser.add_argument('--mutants', type=int, default=20000, help='Number of mutants')
+    parser.add_argument('--tests', type=int, default=50, help='Number of tests run per mutant')
+    args = parser.parse_args()
+    count = args.mutants * args.tests
+
+    records, list_bytes = measure("list of tuples", lambda: list(make_records(args.mutants, args.tests)), count)
+    del records
+
+    def build_store():
+        store = RecordStore()
+        store.extend(make_records(args.mutants, args.tests))
+        return store
+    store, store_bytes = measure("columnar RecordStore", build_store, count)
+    print(f"Column payload: {store.memory_bytes() / len(store):.1f} bytes/record; reduction: {list_bytes / store_bytes:.1f}x")
+
+    # Same iteration API: the records read back unchanged.
+    assert list(store) == list(make_records(args.mutants, args.tests))
+    # 29 bytes of columns per record plus the amortized interned paths.
+    assert store.memory_bytes() == 29 * count
+    assert store_bytes < list_bytes / 3
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# generate_project.py
+"""
+Generator for synthetic C projects used by the end-to-end benchmark.
+
+Each source file holds functions of the form 'int calc_<i>(int a, int b)' whose lines mix
+arithmetic, relational and logical operators. Every line updates the running result r, so
+most mutants change the return value, and r is kept in a small range, so no line can
+overflow. Every function gets a test file 'test_<file>_<function>.c' with expected results
+obtained by compiling and running the original functions once with gcc, so all tests pass on
+the unmutated project and most mutants are killed.
+
+Usage:
+    python benchmarks/generate_project.py OUTPUT_DIR [--files 4] [--functions 5] [--lines 10] [--ops 3]
+"""
+
+import os
+import random
+import argparse
+import subprocess
+import tempfile
+from typing import Dict, List, Tuple
+
+TEST_INPUTS = [(0, 0), (1, 2), (5, 3), (-4, 7), (9, -2), (13, 13)]
+ARITHMETIC_OPS = ['+', '-']
+RELATIONAL_OPS = ['<', '>', '<=', '>=', '==', '!=']
+LOGICAL_OPS = ['&&', '||']
+
+def arithmetic_expression(rng: random.Random, ops: int) -> str:
+    """A linear expression in r, a and b with the given number of operators ('*' only by constants)."""
+    terms = ['r']
+    for _ in range(ops):
+        if rng.random() < 0.3:
+            terms.append(f"* {rng.randint(2, 5)}")
+        else:
+            terms.append(f"{rng.choice(ARITHMETIC_OPS)} {rng.choice(['a', 'b', str(rng.randint(1, 9))])}")
+    return ' '.join(terms)
+
+def function_source(name: str, rng: random.Random, lines: int, ops: int) -> str:
+    body = [f"int {name}(int a, int b) {{", "    int r = 0;"]
+    for i in range(lines):
+        if i % 3 == 2:
+            left = f"{rng.choice(['a', 'b', 'r'])} {rng.choice(RELATIONAL_OPS)} {rng.randint(-3, 9)}"
+            right = f"{rng.choice(['a', 'b'])} {rng.choice(RELATIONAL_OPS)} {rng.choice(['a', 'b', 'r'])}"
+            body.append(f"    if ({left} {rng.choice(LOGICAL_OPS)} {right}) {{")
+            body.append(f"        r = r + {rng.randint(1, 9)};")
+            body.append("    }")
+        else:
+            body.append(f"    r = {arithmetic_expression(rng, ops)};")
+            body.append("    if (r > 100000 || r < -100000) {")
+            body.append("        r = r / 7;")
+            body.append("    }")
+    body += ["    return r;", "}"]
+    return '\n'.join(body)
+
+def expected_results(source_path: str, functions: List[str], work_dir: str) -> Dict[str, List[int]]:
+    """Compile the original functions with a driver and return their results for TEST_INPUTS."""
+    driver_path = os.path.join(work_dir, 'driver.c')
+    binary_path = os.path.join(work_dir, 'driver')
+    with open(driver_path, 'w') as f:
+        f.write('#include <stdio.h>\n')
+        f.writelines(f"int {name}(int a, int b);\n" for name in functions)
+        f.write('int main(void) {\n')
+        for name in functions:
+            for a, b in TEST_INPUTS:
+                f.write(f'    printf("%d\\n", {name}({a}, {b}));\n')
+        f.write('    return 0;\n}\n')
+    subprocess.check_call(['gcc', source_path, driver_path, '-o', binary_path])
+    values = [int(v) for v in subprocess.check_output([binary_path]).decode().split()]
+    n = len(TEST_INPUTS)
+    return {name: values[i * n:(i + 1) * n] for i, name in enumerate(functions)}
+
+def generate_project(output_dir: str, files: int = 4, functions: int = 5, lines: int = 10, ops: int = 3,
+                     seed: int = 1) -> Tuple[str, str]:
+    """
+    Write the synthetic project.
+    :return: The source and test directories.
+    """
+    rng = random.Random(seed)
+    src_dir = os.path.join(output_dir, 'src')
+    test_dir = os.path.join(output_dir, 'test')
+    os.makedirs(src_dir, exist_ok=True)
+    os.makedirs(test_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as work_dir:
+        for file_index in range(files):
+            module = f"module_{file_index}"
+            names = [f"calc_{i}" for i in range(functions)]
+            source_path = os.path.join(src_dir, f"{module}.c")
+            with open(source_path, 'w') as f:
+                f.write(f"// {module}.c (generated)\n")
+                f.write('\n\n'.join(function_source(name, rng, lines, ops) for name in names) + '\n')
+            for name, values in expected_results(source_path, names, work_dir).items():
+                with open(os.path.join(test_dir, f"test_{module}_{name}.c"), 'w') as f:
+                    f.write(f"// test_{module}_{name}.c (generated)\n")
+                    f.write(f"int {name}(int a, int b);\n\nint main(void) {{\n")
+                    for (a, b), value in zip(TEST_INPUTS, values):
+                        f.write(f"    if ({name}({a}, {b}) != {value}) return 1;\n")
+                    f.write("    return 0;\n}\n")
+    return src_dir, test_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic C project with matching tests")
+    parser.add_argument('output', help='Directory to write src/ and test/ into')
+    parser.add_argument('--files', type=int, default=4, help='Number of source files')
+    parser.add_argument('--functions', type=int, default=5, help='Functions per source file')
+    parser.add_argument('--lines', type=int, default=10, help='Statement lines per function')
+    parser.add_argument('--ops', type=int, default=3, help='Arithmetic operators per statement line')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+    src_dir, test_dir = generate_project(args.output, args.files, args.functions, args.lines, args.ops, args.seed)
+    print(f"Wrote {src_dir} and {test_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# artifact_cache.py
+"""
+Module for caching compiled mutant objects and mutant/test verdicts by content hash.
+
+Entries live in a local directory and, optionally, on a shared HTTP server:
+    GET <url>/<kind>/<key>   -> 200 with the entry, or 404
+    PUT <url>/<kind>/<key>   -> stores the request body
+A remote hit is copied into the local cache. If the server cannot be reached, the run logs one
+warning and continues with the local cache only.
+
+Run a reference server (one directory on disk, no dependencies) with:
+    python src/artifact_cache.py --dir /srv/utmuter-cache --port 8765
+"""
+
+import os
+import re
+import hashlib
+import argparse
+import logging
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+ENTRY_PATH_PATTERN = re.compile(r'^/([a-z]+)/([0-9a-f]{40})$')
+
+def content_key(*parts: str) -> str:
+    """Return the cache key of a list of content strings."""
+    return hashlib.sha1('\0'.join(parts).encode()).hexdigest()
+
+def write_atomic(path: str, data: bytes):
+    """Write a file so that concurrent readers never see a partial entry."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class ArtifactCache:
+    def __init__(self, local_dir: str, remote_url: Optional[str] = None, salt: str = ''):
+        """
+        :param local_dir: Directory of the local cache.
+        :param remote_url: Base URL of a shared cache server, or None for the local cache only.
+        :param salt: Mixed into every key, e.g. a commit ID covering inputs not hashed here (headers).
+        """
+        self.local_dir = local_dir
+        self.remote_url = remote_url.rstrip('/') if remote_url else None
+        self.salt = salt
+        # Per kind: [local hits, remote hits, misses]; updated by worker threads, read with stats_snapshot()
+        self.stats: Dict[str, List[int]] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: str) -> str:
+        """Return the content hash of a file, read once per run."""
+        if path not in self._file_hashes:
+            with open(path, 'rb') as f:
+                self._file_hashes[path] = hashlib.sha1(f.read()).hexdigest()
+        return self._file_hashes[path]
+
+    def forget(self, path: str):
+        """Drop the remembered content hash of a file that changed."""
+        self._file_hashes.pop(path, None)
+
+    def key(self, *parts: str) -> str:
+        return content_key(self.salt, *parts)
+
+    def _count(self, kind: str, outcome: int):
+        with self._lock:
+            self.stats.setdefault(kind, [0, 0, 0])[outcome] += 1
+
+    def stats_snapshot(self) -> Dict[str, List[int]]:
+        """Return a copy of the per-kind counts that is safe to read while workers run."""
+        with self._lock:
+            return {kind: list(counts) for kind, counts in self.stats.items()}
+
+    def get(self, kind: str, key: str) -> Optional[bytes]:
+        """Return a cached entry from the local cache or the server, or None on a miss."""
+        local_path = os.path.join(self.local_dir, kind, key)
+        if os.path.isfile(local_path):
+            self._count(kind, 0)
+            with open(local_path, 'rb') as f:
+                return f.read()
+        data = self._remote('GET', kind, key)
+        if data is not None:
+            self._count(kind, 1)
+            write_atomic(local_path, data)
+            return data
+        self._count(kind, 2)
+        return None
+
+    def put(self, kind: str, key: str, data: bytes):
+        """Store an entry locally and on the server."""
+        write_atomic(os.path.join(self.local_dir, kind, key), data)
+        self._remote('PUT', kind, key, data)
+
+    def _remote(self, method: str, kind: str, key: str, data: Optional[bytes] = None) -> Optional[bytes]:
+        remote_url = self.remote_url
+        if remote_url is None:
+            return None
+        request = urllib.request.Request(f"{remote_url}/{kind}/{key}", data=data, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=REMOTE_CACHE_TIMEOUT) as response:
+                return response.read() if method == 'GET' else None
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                logger.warning(f"Remote cache {method} {kind}/{key} failed with HTTP {e.code}.")
+            return None
+        except (urllib.error.URLError, OSError) as e:
+            # Several workers can fail at once; the first one disables the remote and warns.
+            with self._lock:
+                disable = self.remote_url is not None
+                self.remote_url = None
+            if disable:
+                logger.warning(f"Remote cache {remote_url} unreachable ({e}). Using the local cache only.")
+            return None
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Reference server: stores every entry as <directory>/<kind>/<key>."""
+    directory = '.'
+
+    def _entry_path(self) -> Optional[str]:
+        m = ENTRY_PATH_PATTERN.match(self.path)
+        if m is None:
+            self.send_error(400, "Expected /<kind>/<sha1 key>")
+            return None
+        return os.path.join(self.directory, m.group(1), m.group(2))
+
+    def do_GET(self):
+        path = self._entry_path()
+        if path is None:
+            return
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PUT(self):
+        path = self._entry_path()
+        if path is None:
+            return
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        write_atomic(path, data)
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def main(argv: Optional[List[str]] = None):
+    """Command line helper: serve a shared artifact cache from a directory."""
+    parser = argparse.ArgumentParser(description="Reference HTTP server for the UTMuter artifact cache")
+    parser.add_argument('--dir', required=True, help='Directory holding the cache entries')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format=LOGGING_FORMAT)
+    CacheRequestHandler.directory = os.path.abspath(args.dir)
+    os.makedirs(CacheRequestHandler.directory, exist_ok=True)
+    server = ThreadingHTTPServer((args.host, args.port), CacheRequestHandler)
+    logger.info(f"Serving artifact cache {CacheRequestHandler.directory} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
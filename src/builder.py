@@ -2,11 +2,20 @@
 """
 Module for building (compiling) C/C++ code.
 """
-import subprocess
+import os
 import logging
 
+from tracing import span
+from process_usage import run_process
+
 logger = logging.getLogger(__name__)
 
+# Language names for source text passed through stdin, by the extension of the file it stands for
+STDIN_LANGUAGES = {
+    '.c': 'c', '.cpp': 'c++', '.cc': 'c++', '.cxx': 'c++',
+    '.i': 'cpp-output', '.ii': 'c++-cpp-output'
+}
+
 class Builder:
     @staticmethod
     def build_sources(source_paths, output_path, compiler="gcc", flags=None):
@@ -20,9 +29,101 @@ class Builder:
         """
         command = [compiler] + (flags if flags else []) + source_paths + ['-o', output_path]
         logger.debug(f"Build command: {' '.join(command)}")
-        try:
-            subprocess.check_call(command, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Build failed for {' '.join(source_paths)}: {e.stderr.decode() if e.stderr else e}")
+        with span('build_sources', output=output_path):
+            returncode, _, stderr, _ = run_process(command)
+        if returncode != 0:
+            logger.error(f"Build failed for {' '.join(source_paths)}: {stderr.decode()}")
+            return False
+        return True
+
+    @staticmethod
+    def compile_object(source_path, object_path, compiler="gcc", flags=None, cwd=None):
+        """
+        Compiles a single translation unit into an object file.
+        :param source_path: The source file path.
+        :param object_path: The path for the compiled object file.
+        :param compiler: The compiler command (e.g., 'gcc', 'g++', 'clang').
+        :param flags: A list of additional compiler flags.
+        :param cwd: Working directory to run the compiler in (relative include paths are resolved against it).
+        :return: True if compilation is successful, False otherwise.
+        """
+        command = [compiler] + (flags if flags else []) + ['-c', source_path, '-o', object_path]
+        logger.debug(f"Compile command: {' '.join(command)}")
+        with span('compile_object', output=object_path):
+            returncode, _, stderr, _ = run_process(command, cwd=cwd)
+        if returncode != 0:
+            logger.error(f"Compilation failed for {source_path}: {stderr.decode()}")
+            return False
+        return True
+
+    @staticmethod
+    def link_objects(object_paths, output_path, compiler="gcc", flags=None):
+        """
+        Links object files into an executable.
+        :param object_paths: A list of object file paths.
+        :param output_path: The path for the linked output binary.
+        :param compiler: The compiler driver used for linking.
+        :param flags: A list of additional linker flags.
+        :return: True if linking is successful, False otherwise.
+        """
+        command = [compiler] + object_paths + ['-o', output_path] + (flags if flags else [])
+        logger.debug(f"Link command: {' '.join(command)}")
+        with span('link_objects', output=output_path):
+            returncode, _, stderr, _ = run_process(command)
+        if returncode != 0:
+            logger.error(f"Link failed for {output_path}: {stderr.decode()}")
             return False
+        return True
+
+    @staticmethod
+    def preprocess_source(source_path, output_path, compiler="gcc", flags=None, cwd=None):
+        """
+        Runs only the preprocessor on a source file, keeping line markers.
+        :param source_path: The source file path.
+        :param output_path: The path for the preprocessed output.
+        :param compiler: The compiler command (e.g., 'gcc', 'g++', 'clang').
+        :param flags: A list of additional compiler flags (include paths, defines).
+        :param cwd: Working directory to run the preprocessor in.
+        :return: True if preprocessing is successful, False otherwise.
+        """
+        command = [compiler] + (flags if flags else []) + ['-E', source_path, '-o', output_path]
+        logger.debug(f"Preprocess command: {' '.join(command)}")
+        with span('preprocess_source', output=output_path):
+            returncode, _, stderr, _ = run_process(command, cwd=cwd)
+        if returncode != 0:
+            logger.error(f"Preprocessing failed for {source_path}: {stderr.decode()}")
+            return False
+        return True
+
+    @staticmethod
+    def build_from_stdin(source_text, language, output_path, other_sources=None, compiler="gcc", flags=None,
+                         compile_only=False, cwd=None):
+        """
+        Compiles source text piped through stdin ('-x <language> -'), optionally together with other source
+        or object files, without writing the text to disk.
+        :param source_text: The source code to compile.
+        :param language: The GCC language name of the text (e.g., 'c', 'c++', 'cpp-output').
+        :param output_path: The path for the compiled output (binary, or object with compile_only).
+        :param other_sources: Additional source/object file paths built and linked together with the text.
+        :param compiler: The compiler command (e.g., 'gcc', 'g++', 'clang').
+        :param flags: A list of additional compiler flags.
+        :param compile_only: Only compile to an object file ('-c').
+        :param cwd: Working directory to run the compiler in.
+        :return: True if compilation is successful, False otherwise.
+        """
+        command = [compiler] + (flags if flags else []) + ['-x', language, '-']
+        if other_sources:
+            command += ['-x', 'none'] + other_sources
+        command += (['-c'] if compile_only else []) + ['-o', output_path]
+        logger.debug(f"Build command (stdin): {' '.join(command)}")
+        with span('build_from_stdin', output=output_path):
+            returncode, _, stderr, _ = run_process(command, input=source_text.encode(), cwd=cwd)
+        if returncode != 0:
+            logger.error(f"Build failed for {output_path}: {stderr.decode()}")
+            return False
+        return True
+
+    @staticmethod
+    def stdin_language(path):
+        """Returns the GCC '-x' language for a source path, based on its extension."""
+        return STDIN_LANGUAGES.get(os.path.splitext(path)[1], 'c')
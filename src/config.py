@@ -0,0 +1,221 @@
+# config.py
+"""
+Module holding the optional run settings shared by MutationTester and Mutator.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import argparse
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from project import Project, ObjectCache
+from mutant_store import MutantIndex, MutantVerdict
+from test_index import TestIndex
+from symbol_index import SymbolIndex
+from kill_matrix import KillMatrix
+from dominators import DominatorAnalysis
+from kill_stats import KillStatistics
+from artifact_cache import ArtifactCache
+from result_writers import JsonLinesWriter
+from record_store import PathTable
+from progress import ProgressTracker
+from tracing import TRACER
+from metrics import Metrics
+from executor import ConcurrencyController, MutantExecutor
+from test_cases import CaseProtocol
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+class MutationConfig:
+    """Optional run settings plus the per-run state derived from them."""
+
+    def __init__(self, project: Optional[Project] = None, preprocess: bool = False, in_memory: bool = False,
+                 keep_mutants: bool = False, scratch_base: Optional[str] = None,
+                 include: Optional[List[str]] = None, exclude: Optional[List[str]] = None, parallel_walk: bool = False,
+                 test_map_rules: Optional[dict] = None, selection: str = SELECTION_NAMES,
+                 prune_unreachable: bool = False, full_kill_matrix: bool = False, smoke_suite: Optional[str] = None,
+                 dominators_only: bool = False, dominators_path: Optional[str] = None,
+                 operators: str = OPERATORS_DEFAULT, selective: bool = False,
+                 selective_threshold: float = DEFAULT_SELECTIVE_THRESHOLD, audit_rate: float = DEFAULT_AUDIT_RATE,
+                 cache: bool = False, cache_dir: Optional[str] = None, remote_cache: Optional[str] = None,
+                 cache_salt: str = '', results_path: Optional[str] = None, junit_path: Optional[str] = None,
+                 by_function: bool = False, details: bool = False, show_progress: bool = True,
+                 status_path: Optional[str] = None, status_interval: float = DEFAULT_STATUS_INTERVAL,
+                 trace_path: Optional[str] = None, resources: bool = False, metrics_port: Optional[int] = None,
+                 metrics_host: str = '127.0.0.1', metrics_textfile: Optional[str] = None, jobs: int = DEFAULT_JOBS,
+                 min_jobs: int = 1, pin_cpus: bool = False, test_cases: Optional[str] = None,
+                 abort_on: Optional[str] = None):
+        self.project = project
+        self.preprocess = preprocess
+        self.in_memory = in_memory
+        self.keep_mutants = keep_mutants
+        self.scratch_base = scratch_base
+        self.include = include
+        self.exclude = exclude
+        self.parallel_walk = parallel_walk
+        self.test_map_rules = test_map_rules
+        self.selection = selection
+        self.test_index: Optional[TestIndex] = None
+        self.symbol_index: Optional[SymbolIndex] = None
+        self.prune_unreachable = prune_unreachable
+        self.unreachable_mutants: List[Tuple[str, str, int]] = []
+        self.full_kill_matrix = full_kill_matrix
+        self.smoke_suite = smoke_suite
+        self.kill_matrix: Optional[KillMatrix] = None
+        self.dominators_only = dominators_only
+        self.dominators_path = dominators_path
+        self.dominator_analysis: Optional[DominatorAnalysis] = None
+        self.mutant_info: Dict[str, dict] = {}
+        self.skipped_subsumed = 0
+        self.operators = operators
+        self.operator_set: Optional[Dict[str, List[str]]] = None
+        self.operator_family_counts: Dict[str, List[int]] = {}
+        self.selective = selective
+        self.selective_threshold = selective_threshold
+        self.audit_rate = audit_rate
+        self.kill_stats: Optional[KillStatistics] = None
+        self.kill_stats_path: Optional[str] = None
+        self.skipped_selective = 0
+        self.saved_executions = 0
+        self.cache = cache or cache_dir is not None or remote_cache is not None
+        self.cache_dir = cache_dir
+        self.remote_cache = remote_cache
+        self.cache_salt = cache_salt
+        self.artifact_cache: Optional[ArtifactCache] = None
+        self.verdict_listeners: List[Callable[[MutantVerdict], None]] = []
+        self.results_path = results_path
+        self.results_writer: Optional[JsonLinesWriter] = None
+        self.junit_path = junit_path
+        self.by_function = by_function
+        self.details = details
+        self.function_counts: Dict[Tuple[str, str], List[int]] = {}
+        self.record_paths = PathTable()
+        self.show_progress = show_progress
+        self.status_path = status_path
+        self.status_interval = status_interval
+        self.progress: Optional[ProgressTracker] = None
+        self.trace_path = trace_path
+        self.resources = resources
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.metrics_textfile = metrics_textfile
+        self.metrics: Optional[Metrics] = None
+        self.jobs = jobs
+        self.min_jobs = min_jobs
+        self.pin_cpus = pin_cpus
+        self.executor: Optional[MutantExecutor] = None
+        self.test_cases = test_cases
+        self.case_protocol: Optional[CaseProtocol] = None
+        self.killing_cases: Dict[str, Dict[str, List[str]]] = {}
+        # Stop a test at the first output line matching this pattern and count it as failed
+        self.abort_pattern: Optional[re.Pattern] = re.compile(abort_on) if abort_on else None
+        self.object_cache: Optional[ObjectCache] = None
+        self.scratch_dir: Optional[str] = None
+        self.mutant_index: Optional[MutantIndex] = None
+
+    @staticmethod
+    def from_args(args: argparse.Namespace) -> "MutationConfig":
+        """Create the configuration from parsed command line arguments."""
+        project = Project.load(args.project) if args.project else None
+        test_map_rules = TestIndex.load_rules(args.test_map) if args.test_map else None
+        return MutationConfig(project=project, preprocess=args.preprocess, in_memory=args.in_memory,
+                              keep_mutants=args.keep_mutants, scratch_base=args.scratch,
+                              include=args.include, exclude=args.exclude, parallel_walk=args.parallel_walk,
+                              test_map_rules=test_map_rules, selection=args.select,
+                              prune_unreachable=args.prune_unreachable, full_kill_matrix=args.kill_matrix,
+                              smoke_suite=args.smoke_suite, dominators_only=args.dominators_only,
+                              dominators_path=args.dominators, operators=args.operators,
+                              selective=args.selective, selective_threshold=args.selective_threshold,
+                              audit_rate=args.audit_rate, cache=args.cache, cache_dir=args.cache_dir,
+                              remote_cache=args.remote_cache, cache_salt=args.cache_salt,
+                              results_path=args.jsonl, junit_path=args.junit, by_function=args.by_function,
+                              details=args.details, show_progress=not args.no_progress,
+                              status_path=args.status_file, status_interval=args.status_interval,
+                              trace_path=args.trace, resources=args.resources, metrics_port=args.metrics_port,
+                              metrics_host=args.metrics_host, metrics_textfile=args.metrics_textfile,
+                              jobs=args.jobs, min_jobs=args.min_jobs, pin_cpus=args.pin_cpus,
+                              test_cases=args.test_cases, abort_on=args.abort_on)
+
+    @property
+    def write_mutant_sources(self) -> bool:
+        """Mutant sources go to disk only to be built from a file, or when explicitly kept."""
+        return not self.in_memory or self.keep_mutants
+
+    def prepare(self, mutants_dir: str):
+        """Set up per-run state that lives inside the mutants directory or the scratch area."""
+        if self.trace_path:
+            TRACER.enable()
+        self.mutant_index = MutantIndex(os.path.join(mutants_dir, MUTANT_INDEX_FILE))
+        if self.full_kill_matrix:
+            self.kill_matrix = KillMatrix()
+        if self.dominators_path is None:
+            self.dominators_path = os.path.join(mutants_dir, DOMINATORS_FILE)
+        if self.dominators_only:
+            self.dominator_analysis = DominatorAnalysis.load(self.dominators_path)
+            logger.info(f"Loaded dominator analysis for {len(self.dominator_analysis.functions)} function(s) from {self.dominators_path}.")
+        if self.results_path is None:
+            self.results_path = os.path.join(mutants_dir, RESULTS_FILE)
+        self.results_writer = JsonLinesWriter(self.results_path)
+        self.verdict_listeners.append(self.results_writer)
+        self.progress = ProgressTracker(self.show_progress, self.status_path, self.status_interval)
+        self.verdict_listeners.append(self.progress)
+        self.executor = MutantExecutor(ConcurrencyController(self.min_jobs, self.jobs), self.pin_cpus)
+        if self.jobs > 1:
+            controller = self.executor.controller
+            limits = f"between {controller.floor} and {controller.ceiling}" if controller.adaptive else f"at {controller.ceiling}"
+            logger.info(f"Running up to {self.jobs} mutants in parallel; build/test slots {limits}.")
+        if self.metrics_port is not None or self.metrics_textfile:
+            self.metrics = Metrics(self, self.metrics_textfile)
+            self.progress.phase_observer = self.metrics.observe_phase
+            self.verdict_listeners.append(self.metrics)
+            if self.metrics_port is not None:
+                self.metrics.serve(self.metrics_host, self.metrics_port)
+        if self.test_cases:
+            self.case_protocol = CaseProtocol.load(self.test_cases)
+            logger.info(f"Running only the test cases selected per function ({self.case_protocol.name} protocol).")
+        self.kill_stats_path = os.path.join(mutants_dir, KILL_STATS_FILE)
+        self.kill_stats = KillStatistics.load(self.kill_stats_path, threshold=self.selective_threshold,
+                                              audit_rate=self.audit_rate)
+        if self.selective:
+            logger.info(f"Selective mutation: {self.kill_stats.stable_categories()} stable (function, operator) "
+                        f"categories sampled at {self.audit_rate:.0%}.")
+        if self.cache:
+            self.artifact_cache = ArtifactCache(self.cache_dir or os.path.join(mutants_dir, ARTIFACT_CACHE_SUBDIR),
+                                                self.remote_cache, self.cache_salt)
+        if self.project is not None:
+            self.object_cache = ObjectCache(self.project, os.path.join(mutants_dir, OBJECT_CACHE_SUBDIR))
+        if self.in_memory:
+            base = self.scratch_base or MutationConfig.default_scratch_base()
+            self.scratch_dir = tempfile.mkdtemp(prefix=SCRATCH_DIR_PREFIX, dir=base)
+            logger.info(f"Using scratch directory {self.scratch_dir} for mutant binaries.")
+        else:
+            self.scratch_dir = mutants_dir
+
+    def cleanup(self):
+        """Stop the executor, close the mutant index and results file and remove the per-run scratch directory."""
+        if self.executor is not None:
+            self.executor.close()
+        if self.mutant_index is not None:
+            self.mutant_index.close()
+        if self.results_writer is not None:
+            self.results_writer.close()
+        if self.progress is not None:
+            self.progress.close()
+        if self.metrics is not None:
+            self.metrics.close()
+        if self.trace_path:
+            TRACER.save(self.trace_path)
+            logger.info(f"Trace written to {self.trace_path}.")
+        if self.in_memory and self.scratch_dir and os.path.isdir(self.scratch_dir):
+            shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+    @staticmethod
+    def default_scratch_base() -> str:
+        """Prefer a RAM-backed directory (/dev/shm) and fall back to the system temp directory."""
+        if os.path.isdir(RAM_SCRATCH_DIR) and os.access(RAM_SCRATCH_DIR, os.W_OK):
+            return RAM_SCRATCH_DIR
+        return tempfile.gettempdir()
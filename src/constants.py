@@ -5,6 +5,78 @@ VERSION = "V1.0.0"
 
 # Default Directories
 DEFAULT_MUTANTS_SUBDIR = "mutants_output"
+OBJECT_CACHE_SUBDIR = "object_cache"
+SYMBOL_OBJECTS_SUBDIR = "symbol_objects"
+REACHABILITY_SUBDIR = "reachability"
+RAM_SCRATCH_DIR = "/dev/shm"
+SCRATCH_DIR_PREFIX = "utmuter_"
+
+# Source Discovery
+IGNORE_FILE = ".utmuterignore"
+DEFAULT_EXCLUDE_PATTERNS = (
+    DEFAULT_MUTANTS_SUBDIR, "build", "build-*", "cmake-build-*", "CMakeFiles", ".git", ".svn"
+)
+
+# Test Selection
+SELECTION_NAMES = "names"
+SELECTION_SYMBOLS = "symbols"
+
+# Operator Sets
+OPERATORS_DEFAULT = "default"
+OPERATORS_SUFFICIENT = "sufficient"
+# Replacements of a whole 'lhs op rhs' expression instead of the operator
+EXPRESSION_REPLACEMENTS = {"false": "0", "true": "1", "lhs": None, "rhs": None}
+# Replacements of a logical connector that compare the truth values of both operands
+LOGICAL_OPERATORS = {"&&", "||"}
+TRUTH_COMPARISONS = {"==", "!="}
+
+# Test Case Protocols
+CASES_GTEST = "gtest"
+CASES_ENV = "env"
+CASE_FILTER_ENV = "UTMUTER_CASE_FILTER"
+
+# Artifact Cache
+ARTIFACT_CACHE_SUBDIR = "artifact_cache"
+REMOTE_CACHE_TIMEOUT = 5
+
+# Result Files
+RESULTS_FILE = "results.jsonl"
+
+# Progress
+STATUS_LINE_INTERVAL = 0.2
+DEFAULT_STATUS_INTERVAL = 5.0
+ETA_SMOOTHING = 0.1
+
+# Metrics
+METRICS_SECONDS_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+# Concurrency
+DEFAULT_JOBS = 1
+CONCURRENCY_ADJUST_INTERVAL = 2.0
+LOAD_HIGH_PER_CPU = 1.25
+LOAD_LOW_PER_CPU = 0.9
+MEMORY_LOW_FRACTION = 0.1
+QUEUE_WAIT_TARGET = 0.05
+MEMINFO_FILE = "/proc/meminfo"
+
+# Watch Mode
+MODE_RUN = "run"
+MODE_WATCH = "watch"
+DEFAULT_WATCH_INTERVAL = 0.5
+
+# Kill Matrix
+KILL_MATRIX_FILE = "kill_matrix.json"
+SMOKE_SUITE_FILE = "smoke_tests.txt"
+DOMINATORS_FILE = "dominators.json"
+
+# Selective Mutation
+KILL_STATS_FILE = "kill_stats.json"
+DEFAULT_SELECTIVE_THRESHOLD = 0.98
+DEFAULT_AUDIT_RATE = 0.1
+
+# Mutant Index
+MUTANT_INDEX_FILE = "mutants.idx"
+INDEX_SOURCE_TAG = "@source"
 
 # Logging Configuration
 LOGGING_FORMAT = "%(levelname)s: %(message)s"
@@ -0,0 +1,114 @@
+# dominators.py
+"""
+Module for dominator (subsumption) analysis over a recorded kill matrix.
+
+Mutant A subsumes mutant B when A is killed by at least one test and every test that kills A
+also kills B. Within a function all mutants run against the same tests, so the analysis is done
+per function: mutants with identical kill sets are merged, and the dominators are the kill sets
+that have no strict subset among the others. Killing one representative of every dominator set
+kills every killed mutant of the function, so subsumed mutants can be skipped on later runs of the
+unchanged function. Survivors are never subsumed and always stay in the run set.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional, Set
+
+from kill_matrix import KillMatrix
+
+logger = logging.getLogger(__name__)
+
+def stable_mutant_id(source_name: str, func_name: str, function_hash: str, relative_offset: int,
+                     old: str, new: str) -> str:
+    """
+    Return an ID that stays the same while the enclosing function's text is unchanged, even if
+    code elsewhere in the file moves.
+    """
+    key = f"{source_name}|{func_name}|{function_hash}|{relative_offset}|{old}|{new}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def function_key(source_path: str, func_name: str) -> str:
+    return f"{os.path.basename(source_path)}::{func_name}"
+
+class DominatorAnalysis:
+    """Per-function dominator sets, keyed by stable mutant IDs and grouped by operator."""
+
+    def __init__(self, functions: Optional[Dict[str, dict]] = None):
+        self.functions: Dict[str, dict] = functions or {}
+
+    @staticmethod
+    def compute(kill_matrix: KillMatrix, mutant_info: Dict[str, dict]) -> "DominatorAnalysis":
+        """
+        :param mutant_info: Per mutant ID: {'function_key', 'function_hash', 'operator'}.
+        """
+        rows_by_function: Dict[str, List[int]] = {}
+        for i, mutant_id in enumerate(kill_matrix.mutants):
+            rows_by_function.setdefault(mutant_info[mutant_id]['function_key'], []).append(i)
+
+        analysis = DominatorAnalysis()
+        for key, rows in rows_by_function.items():
+            kill_sets = {kill_matrix.killed[i] for i in rows if kill_matrix.killed[i]}
+            dominator_sets = {
+                s for s in kill_sets
+                if not any(t != s and t & s == t for t in kill_sets)
+            }
+            dominators: Dict[str, int] = {}
+            represented: Set[int] = set()
+            subsumed: Dict[str, List[str]] = {}
+            operators: Dict[str, Dict[str, List[str]]] = {}
+            for i in rows:
+                mutant_id = kill_matrix.mutants[i]
+                row = kill_matrix.killed[i]
+                group = operators.setdefault(mutant_info[mutant_id]['operator'], {'dominators': [], 'subsumed': []})
+                if row in dominator_sets and row not in represented:
+                    represented.add(row)
+                    dominators[mutant_id] = row
+                    group['dominators'].append(mutant_id)
+                elif row:
+                    group['subsumed'].append(mutant_id)
+                    subsumed[mutant_id] = []
+            for i in rows:
+                mutant_id = kill_matrix.mutants[i]
+                if mutant_id in subsumed:
+                    row = kill_matrix.killed[i]
+                    subsumed[mutant_id] = [d for d, d_row in dominators.items() if d_row & row == d_row]
+            analysis.functions[key] = {
+                'function_hash': mutant_info[kill_matrix.mutants[rows[0]]]['function_hash'],
+                'mutants': len(rows),
+                'dominators': list(dominators),
+                'subsumed': subsumed,
+                'operators': operators
+            }
+        return analysis
+
+    def merge(self, other: "DominatorAnalysis"):
+        """Replace the entries of functions analysed again in another run."""
+        self.functions.update(other.functions)
+
+    def should_run(self, function_key: str, function_hash: str, mutant_id: str) -> bool:
+        """Skip only mutants recorded as subsumed in an unchanged function."""
+        entry = self.functions.get(function_key)
+        if entry is None or entry['function_hash'] != function_hash:
+            return True
+        return mutant_id not in entry['subsumed']
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            'functions': len(self.functions),
+            'mutants': sum(e['mutants'] for e in self.functions.values()),
+            'dominators': sum(len(e['dominators']) for e in self.functions.values()),
+            'subsumed': sum(len(e['subsumed']) for e in self.functions.values())
+        }
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.functions, f, indent=1)
+
+    @staticmethod
+    def load(path: str) -> "DominatorAnalysis":
+        if not os.path.isfile(path):
+            return DominatorAnalysis()
+        with open(path, 'r') as f:
+            return DominatorAnalysis(json.load(f))
@@ -0,0 +1,159 @@
+# executor.py
+"""
+Module for running mutants in parallel with an adaptive number of builds and tests.
+
+The executor runs up to 'ceiling' mutants at once in worker threads. How many of them may be in
+the build stage (compile/link) and in the test stage at the same time is decided by the
+concurrency controller: a worker takes a slot of the stage before starting its processes. Every
+CONCURRENCY_ADJUST_INTERVAL seconds the controller revises the limit of each stage, between the
+floor and the ceiling:
+  - the load average per CPU is above LOAD_HIGH_PER_CPU, or less than MEMORY_LOW_FRACTION of the
+    memory is available: the limits are cut by a quarter (at least one slot);
+  - otherwise, a stage whose workers waited longer than QUEUE_WAIT_TARGET on average for a slot,
+    while the load is below LOAD_LOW_PER_CPU, gets one more slot.
+Workers can be pinned to one CPU each; their compiler and test processes inherit the affinity.
+With a ceiling of 1 mutants run inline in the calling thread, as without the executor.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('build', 'test')
+
+def load_per_cpu() -> Optional[float]:
+    """Return the one-minute load average divided by the number of CPUs, or None if unavailable."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+def available_memory_fraction() -> Optional[float]:
+    """Return MemAvailable / MemTotal from /proc/meminfo, or None if unavailable."""
+    try:
+        with open(MEMINFO_FILE) as f:
+            fields = dict(line.split(':', 1) for line in f)
+        return int(fields['MemAvailable'].split()[0]) / int(fields['MemTotal'].split()[0])
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+class ConcurrencyController:
+    def __init__(self, floor: int = 1, ceiling: int = DEFAULT_JOBS, adjust_interval: float = CONCURRENCY_ADJUST_INTERVAL):
+        self.floor = max(1, min(floor, ceiling))
+        self.ceiling = max(1, ceiling)
+        start = min(self.ceiling, max(self.floor, os.cpu_count() or 1))
+        self.limits: Dict[str, int] = {stage: start for stage in STAGES}
+        self.active: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.adjust_interval = adjust_interval
+        self.adjustments = 0
+        # Per stage: [seconds waited for a slot, slots taken] since the last adjustment
+        self._waits: Dict[str, List[float]] = {stage: [0.0, 0] for stage in STAGES}
+        self._last_adjust = time.perf_counter()
+        self._cond = threading.Condition()
+
+    @property
+    def adaptive(self) -> bool:
+        return self.floor < self.ceiling
+
+    @contextmanager
+    def slot(self, stage: str):
+        """Hold one of the stage's slots for the duration of the block, waiting while all are taken."""
+        start = time.perf_counter()
+        with self._cond:
+            while self.active[stage] >= self.limits[stage]:
+                self._cond.wait()
+            self.active[stage] += 1
+            waits = self._waits[stage]
+            waits[0] += time.perf_counter() - start
+            waits[1] += 1
+            if self.adaptive:
+                self._maybe_adjust()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.active[stage] -= 1
+                self._cond.notify_all()
+
+    def _maybe_adjust(self):
+        """Revise the stage limits at most every adjust_interval seconds (called with the lock held)."""
+        now = time.perf_counter()
+        if now - self._last_adjust < self.adjust_interval:
+            return
+        self._last_adjust = now
+        load = load_per_cpu()
+        memory = available_memory_fraction()
+        pressure = (load is not None and load > LOAD_HIGH_PER_CPU) or (memory is not None and memory < MEMORY_LOW_FRACTION)
+        for stage in STAGES:
+            waited, taken = self._waits[stage]
+            self._waits[stage] = [0.0, 0]
+            limit = self.limits[stage]
+            if pressure:
+                new_limit = max(self.floor, limit - max(1, limit // 4))
+            elif taken and waited / taken > QUEUE_WAIT_TARGET and (load is None or load < LOAD_LOW_PER_CPU):
+                new_limit = min(self.ceiling, limit + 1)
+            else:
+                continue
+            if new_limit != limit:
+                self.limits[stage] = new_limit
+                self.adjustments += 1
+                logger.info(f"Concurrency: {stage} {limit} -> {new_limit} (load/CPU "
+                            f"{'n/a' if load is None else f'{load:.2f}'}, available memory "
+                            f"{'n/a' if memory is None else f'{memory:.0%}'}, mean wait {waited / taken if taken else 0:.3f} s)")
+        self._cond.notify_all()
+
+class MutantExecutor:
+    def __init__(self, controller: ConcurrencyController, pin_cpus: bool = False):
+        """:param pin_cpus: Pin every worker thread (and so its child processes) to one CPU of the allowed set."""
+        self.controller = controller
+        self._cpus: List[int] = []
+        self._next_cpu = 0
+        self._cpu_lock = threading.Lock()
+        if pin_cpus:
+            if hasattr(os, 'sched_setaffinity'):
+                self._cpus = sorted(os.sched_getaffinity(0))
+            else:
+                logger.warning("CPU affinity is not supported on this platform. Workers are not pinned.")
+        self._pool = ThreadPoolExecutor(controller.ceiling, thread_name_prefix='mutant',
+                                        initializer=self._pin_worker) if controller.ceiling > 1 else None
+        if self._pool is None:
+            self._pin_worker()
+
+    @property
+    def workers(self) -> int:
+        return self.controller.ceiling
+
+    def _pin_worker(self):
+        if not self._cpus:
+            return
+        with self._cpu_lock:
+            cpu = self._cpus[self._next_cpu % len(self._cpus)]
+            self._next_cpu += 1
+        os.sched_setaffinity(0, {cpu})
+        logger.debug(f"Worker {threading.current_thread().name} pinned to CPU {cpu}.")
+
+    def slot(self, stage: str):
+        return self.controller.slot(stage)
+
+    def submit(self, fn, *args) -> Future:
+        """Run fn(*args) on a worker, or right away in this thread without a pool."""
+        if self._pool is not None:
+            return self._pool.submit(fn, *args)
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
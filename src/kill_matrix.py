@@ -0,0 +1,110 @@
+# kill_matrix.py
+"""
+Module for recording the full mutant x test kill matrix as packed bitsets.
+
+Each mutant row is a Python int used as a bitset over test indices (bit j set = test j killed the
+mutant), so a row costs about one bit per test and set operations run word-wise in C.
+100k mutants x 5k tests is roughly 2 x 65 MB (kill and executed rows).
+"""
+
+import json
+import logging
+from typing import List, Dict
+
+logger = logging.getLogger(__name__)
+
+class KillMatrix:
+    def __init__(self):
+        self.tests: List[str] = []
+        self.mutants: List[str] = []
+        self.killed: List[int] = []
+        self.executed: List[int] = []
+        self._test_ids: Dict[str, int] = {}
+
+    def test_id(self, test_path: str) -> int:
+        """Return the column index of a test, adding a new column on first use."""
+        if test_path not in self._test_ids:
+            self._test_ids[test_path] = len(self.tests)
+            self.tests.append(test_path)
+        return self._test_ids[test_path]
+
+    def bitset(self, test_paths: List[str]) -> int:
+        bits = 0
+        for test_path in test_paths:
+            bits |= 1 << self.test_id(test_path)
+        return bits
+
+    def add(self, mutant_id: str, executed_tests: List[str], killing_tests: List[str]):
+        """Record one mutant row: the tests that ran against it and the tests that killed it."""
+        self.mutants.append(mutant_id)
+        self.executed.append(self.bitset(executed_tests))
+        self.killed.append(self.bitset(killing_tests))
+
+    def tests_of(self, bits: int) -> List[str]:
+        return [self.tests[j] for j in range(bits.bit_length()) if bits >> j & 1]
+
+    def columns(self) -> List[int]:
+        """Return, per test, the bitset of mutant indices it kills."""
+        columns = [0] * len(self.tests)
+        for i, row in enumerate(self.killed):
+            while row:
+                low = row & -row
+                columns[low.bit_length() - 1] |= 1 << i
+                row ^= low
+        return columns
+
+    def minimize(self) -> List[str]:
+        """
+        Greedy set cover: repeatedly pick the test killing the most not-yet-killed mutants until the
+        chosen subset kills every mutant the full suite kills.
+        """
+        columns = self.columns()
+        uncovered = 0
+        for column in columns:
+            uncovered |= column
+        chosen: List[str] = []
+        while uncovered:
+            best = max(range(len(columns)), key=lambda j: (columns[j] & uncovered).bit_count())
+            gain = columns[best] & uncovered
+            if not gain:
+                break
+            chosen.append(self.tests[best])
+            uncovered &= ~gain
+        return chosen
+
+    def memory_bytes(self) -> int:
+        """Approximate payload size of the bitset rows (excluding Python object headers)."""
+        return sum((row.bit_length() + 7) // 8 for row in self.killed + self.executed)
+
+    def save(self, path: str):
+        """Write the matrix as JSON with hex-encoded rows."""
+        with open(path, 'w') as f:
+            json.dump({
+                'tests': self.tests,
+                'mutants': self.mutants,
+                'killed': [format(row, 'x') for row in self.killed],
+                'executed': [format(row, 'x') for row in self.executed]
+            }, f)
+
+    @staticmethod
+    def load(path: str) -> "KillMatrix":
+        with open(path, 'r') as f:
+            data = json.load(f)
+        matrix = KillMatrix()
+        for test_path in data['tests']:
+            matrix.test_id(test_path)
+        matrix.mutants = data['mutants']
+        matrix.killed = [int(row, 16) for row in data['killed']]
+        matrix.executed = [int(row, 16) for row in data['executed']]
+        return matrix
+
+    @staticmethod
+    def read_smoke_suite(path: str) -> List[str]:
+        """Read a test list written by save_smoke_suite (one path per line)."""
+        with open(path, 'r') as f:
+            return [line.strip() for line in f if line.strip()]
+
+    @staticmethod
+    def save_smoke_suite(path: str, tests: List[str]):
+        with open(path, 'w') as f:
+            f.writelines(f"{test_path}\n" for test_path in tests)
@@ -0,0 +1,103 @@
+# kill_stats.py
+"""
+Module for the per-(function, operator) kill statistics kept across runs.
+
+Each category records its mutant and kill counts over all runs and the kill rate of its most
+recent runs. A category whose recent kill rates all stay above a threshold is considered stable:
+its mutants are always killed and add no information, so selective runs only execute a small
+random audit sample of them, at least one mutant per category and run. Audited mutants keep updating the statistics, so a category that
+starts producing survivors drops back to full execution. The test executions of each category's
+mutants are counted too, to estimate what skipping one of its mutants saves.
+"""
+
+import os
+import json
+import math
+import random
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+RECENT_RUNS = 5
+
+class KillStatistics:
+    def __init__(self, categories: Optional[Dict[str, Dict[str, dict]]] = None, threshold: float = 0.98,
+                 min_runs: int = 3, audit_rate: float = 0.1, seed: Optional[int] = None):
+        """
+        :param categories: Per function key, per operator: {'mutants', 'killed', 'recent': [kill rate per run],
+            'executions': test executions, 'counted': mutants whose executions were counted}.
+        :param threshold: Minimum kill rate, overall and in each recent run, of a stable category.
+        :param min_runs: Minimum number of recorded runs before a category can be down-sampled.
+        :param audit_rate: Fraction of a stable category's mutants that still run.
+        """
+        self.categories = categories or {}
+        self.threshold = threshold
+        self.min_runs = min_runs
+        self.audit_rate = audit_rate
+        self.random = random.Random(seed)
+        self._run_counts: Dict[Tuple[str, str], List[int]] = {}
+
+    def is_stable(self, function_key: str, operator: str) -> bool:
+        entry = self.categories.get(function_key, {}).get(operator)
+        if entry is None or len(entry['recent']) < self.min_runs:
+            return False
+        return entry['killed'] >= self.threshold * entry['mutants'] and min(entry['recent']) >= self.threshold
+
+    def audit_sample(self, function_key: str, mutants: List[Tuple[int, str]]) -> Set[int]:
+        """
+        Choose the mutants of a function that run: every mutant of an unstable category, and
+        max(1, ceil(audit_rate * n)) random mutants of a stable category with n mutants.
+        :param mutants: (index, operator) of each candidate mutant.
+        :return: The indexes of the mutants to run.
+        """
+        by_operator: Dict[str, List[int]] = {}
+        for index, operator in mutants:
+            by_operator.setdefault(operator, []).append(index)
+        selected: Set[int] = set()
+        for operator, indexes in by_operator.items():
+            if self.is_stable(function_key, operator):
+                indexes = self.random.sample(indexes, max(1, math.ceil(self.audit_rate * len(indexes))))
+            selected.update(indexes)
+        return selected
+
+    def record(self, function_key: str, operator: str, killed: bool, executions: int = 1):
+        """Count one executed mutant of this run and the test executions it took."""
+        counts = self._run_counts.setdefault((function_key, operator), [0, 0, 0])
+        counts[0] += 1
+        counts[1] += int(killed)
+        counts[2] += executions
+
+    def mean_executions(self, function_key: str, operator: str) -> Optional[float]:
+        """Return the mean test executions per mutant of a category, or None if none were counted."""
+        entry = self.categories.get(function_key, {}).get(operator)
+        if entry is None or not entry.get('counted'):
+            return None
+        return entry['executions'] / entry['counted']
+
+    def stable_categories(self) -> int:
+        return sum(self.is_stable(key, op) for key, ops in self.categories.items() for op in ops)
+
+    def commit_run(self):
+        """Fold the counts of this run into the per-category statistics."""
+        for (function_key, operator), (mutants, killed, executions) in self._run_counts.items():
+            entry = self.categories.setdefault(function_key, {}).setdefault(
+                operator, {'mutants': 0, 'killed': 0, 'recent': []}
+            )
+            entry['mutants'] += mutants
+            entry['killed'] += killed
+            entry['recent'] = (entry['recent'] + [killed / mutants])[-RECENT_RUNS:]
+            entry['executions'] = entry.get('executions', 0) + executions
+            entry['counted'] = entry.get('counted', 0) + mutants
+        self._run_counts = {}
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.categories, f, indent=1)
+
+    @staticmethod
+    def load(path: str, **kwargs) -> "KillStatistics":
+        if not os.path.isfile(path):
+            return KillStatistics(**kwargs)
+        with open(path, 'r') as f:
+            return KillStatistics(json.load(f), **kwargs)
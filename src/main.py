@@ -1,19 +1,32 @@
 import os
+import time
 import argparse
+import resource
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from parser import Parser
 from mutator import Mutator
 from reporter import Reporter
+from config import MutationConfig
+from test_index import TestIndex
+from symbol_index import SymbolIndex
+from kill_matrix import KillMatrix
+from dominators import DominatorAnalysis
+from watcher import Watcher
+from result_writers import write_junit
+from record_store import RecordStore
+from tracing import span
 from constants import *
 
 logger = logging.getLogger(__name__)
 
 class MutationTester:
-    def __init__(self, source_args: List[str], test_arg: List[str], base_mutants_dir: Optional[str] = None):
+    def __init__(self, source_args: List[str], test_arg: List[str], base_mutants_dir: Optional[str] = None,
+                 config: Optional[MutationConfig] = None):
         self.source_args = source_args
         self.test_arg = test_arg
+        self.config = config if config is not None else MutationConfig()
 
         # Determine mutants_dir
         if base_mutants_dir is None:
@@ -21,9 +34,10 @@ class MutationTester:
         else:
             self.mutants_dir = os.path.join(base_mutants_dir, DEFAULT_MUTANTS_SUBDIR)
         os.makedirs(self.mutants_dir, exist_ok=True)
+        self.config.prepare(self.mutants_dir)
         self.source_paths = []
         self.test_paths = []
-        self.all_mutant_test_records = []
+        self.all_mutant_test_records = RecordStore(self.config.record_paths)
         self.total = 0
         self.killed = 0
         self.survived = 0
@@ -31,52 +45,189 @@ class MutationTester:
     @staticmethod
     def parse_args() -> argparse.Namespace:
         parser = argparse.ArgumentParser(description=DESCRIPTION)
+        parser.add_argument('mode', nargs='?', choices=[MODE_RUN, MODE_WATCH], default=MODE_RUN,
+                            help=f"'{MODE_RUN}' (default) runs once; '{MODE_WATCH}' re-runs the mutants of changed functions on every save")
+        parser.add_argument('--watch-interval', type=float, default=DEFAULT_WATCH_INTERVAL,
+                            help=f'Seconds between polls of the watched files in watch mode (default: {DEFAULT_WATCH_INTERVAL})')
         parser.add_argument('--source', required=True, nargs='+', help='Path(s) to C/C++ source file(s) or folder(s)')
         parser.add_argument('--test', required=True, help='Path to a C/C++ test source file or folder')
         parser.add_argument('--mut', required=False, help='Base directory to store generated mutant files and binaries.')
+        parser.add_argument('--project', required=False, help='compile_commands.json or project file with per-file flags and the link set')
+        parser.add_argument('--include', action='append', help='Glob pattern of files to collect (repeatable)')
+        parser.add_argument('--exclude', action='append', help=f'Glob pattern of files/folders to skip (repeatable); {IGNORE_FILE} files are honoured too')
+        parser.add_argument('--parallel-walk', action='store_true', help='Scan large source trees with parallel threads')
+        parser.add_argument('--test-map', required=False, help='JSON file with explicit source/function to test mapping rules')
+        parser.add_argument('--select', choices=[SELECTION_NAMES, SELECTION_SYMBOLS], default=SELECTION_NAMES,
+                            help='Select tests per function by file names (default) or by symbol references read with nm')
+        parser.add_argument('--test-cases', required=False,
+                            help=f"Run only the test cases of each binary selected for the mutated function: '{CASES_GTEST}', "
+                                 f"'{CASES_ENV}' (${CASE_FILTER_ENV} filter, PASS/FAIL lines) or a JSON protocol file")
+        parser.add_argument('--abort-on', required=False, metavar='REGEX',
+                            help="Stop a test at the first output line matching this regex (e.g. 'FAILED|Checks failed: [1-9]') and count the mutant as killed")
+        parser.add_argument('--prune-unreachable', action='store_true',
+                            help='Skip mutants in functions that no test binary links in (--gc-sections pre-pass)')
+        parser.add_argument('--kill-matrix', action='store_true',
+                            help='Run every relevant test against every mutant, record the kill matrix and compute a minimal test subset')
+        parser.add_argument('--smoke-suite', required=False, help=f'Only use the tests listed in this file (e.g. a {SMOKE_SUITE_FILE} from a --kill-matrix run)')
+        parser.add_argument('--dominators-only', action='store_true',
+                            help='Skip mutants recorded as subsumed by a previous --kill-matrix run in unchanged functions')
+        parser.add_argument('--dominators', required=False, help=f'Dominator analysis file (default: <mutants dir>/{DOMINATORS_FILE})')
+        parser.add_argument('--operators', default=OPERATORS_DEFAULT,
+                            help=f"Operator set: '{OPERATORS_DEFAULT}' (one replacement per operator), '{OPERATORS_SUFFICIENT}' "
+                                 "(minimal sufficient ROR/LCR replacements) or a JSON file mapping operators to replacements")
+        parser.add_argument('--selective', action='store_true',
+                            help=f'Only run an audit sample of (function, operator) categories whose kill rate is stable above the threshold ({KILL_STATS_FILE})')
+        parser.add_argument('--selective-threshold', type=float, default=DEFAULT_SELECTIVE_THRESHOLD,
+                            help=f'Kill rate above which a category is down-sampled by --selective (default: {DEFAULT_SELECTIVE_THRESHOLD})')
+        parser.add_argument('--audit-rate', type=float, default=DEFAULT_AUDIT_RATE,
+                            help=f'Fraction of a down-sampled category that still runs (default: {DEFAULT_AUDIT_RATE})')
+        parser.add_argument('--cache', action='store_true',
+                            help=f'Reuse mutant objects and mutant/test verdicts by content hash (default dir: <mutants dir>/{ARTIFACT_CACHE_SUBDIR})')
+        parser.add_argument('--cache-dir', required=False, help='Local artifact cache directory (implies --cache)')
+        parser.add_argument('--remote-cache', required=False,
+                            help='Base URL of a shared artifact cache server, e.g. http://cachehost:8765 (implies --cache)')
+        parser.add_argument('--cache-salt', default='', help='Extra cache key component, e.g. the commit ID')
+        parser.add_argument('--jsonl', required=False,
+                            help=f'JSON Lines file receiving one line per mutant verdict as it is known (default: <mutants dir>/{RESULTS_FILE})')
+        parser.add_argument('--junit', required=False, help='Write JUnit XML (one test case per mutant) to this file at the end of the run')
+        parser.add_argument('--by-function', action='store_true', help='Print a per-function breakdown in the summary')
+        parser.add_argument('--details', action='store_true', help='Print one row per (mutant, test) record in the summary')
+        parser.add_argument('--no-progress', action='store_true', help='Do not draw the live progress line on the terminal')
+        parser.add_argument('--status-file', required=False, help='Periodically write progress, throughput and ETA as JSON to this file')
+        parser.add_argument('--status-interval', type=float, default=DEFAULT_STATUS_INTERVAL,
+                            help=f'Seconds between status file updates (default: {DEFAULT_STATUS_INTERVAL})')
+        parser.add_argument('--resources', action='store_true',
+                            help='Print the slowest tests, the peak-memory mutants and CPU against wall time in the summary')
+        parser.add_argument('--metrics-port', type=int, required=False,
+                            help='Serve live OpenMetrics on http://<metrics host>:<port>/metrics for Prometheus (off by default)')
+        parser.add_argument('--metrics-host', default='127.0.0.1', help='Address of the metrics endpoint (default: 127.0.0.1)')
+        parser.add_argument('--metrics-textfile', required=False,
+                            help='Keep the metrics in this file for the node_exporter textfile collector (off by default)')
+        parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                            help=f'Maximum number of mutants built and tested in parallel (default: {DEFAULT_JOBS})')
+        parser.add_argument('--min-jobs', type=int, default=1,
+                            help='Lowest number of parallel builds/tests the adaptive controller may go down to (default: 1)')
+        parser.add_argument('--pin-cpus', action='store_true', help='Pin every worker and its processes to one CPU')
+        parser.add_argument('--trace', required=False, help='Write timing spans of all phases to this file in Chrome trace-event format')
+        parser.add_argument('--preprocess', action='store_true', help='Preprocess each source once and mutate the preprocessed translation unit')
+        parser.add_argument('--in-memory', action='store_true', help='Pipe mutant sources to the compiler via stdin and build in a RAM-backed scratch directory')
+        parser.add_argument('--keep-mutants', action='store_true', help='Keep full mutant sources in the mutants directory (by default only the patch index is kept)')
+        parser.add_argument('--scratch', required=False, help='Scratch directory for mutant binaries in --in-memory mode (default: /dev/shm or the temp dir)')
         return parser.parse_args()
 
+    def collect_paths(self) -> Tuple[List[str], List[str]]:
+        """Walk the source and test arguments; return the source and test paths (watch mode calls this on every poll)."""
+        walk_options = dict(
+            include=self.config.include, exclude=self.config.exclude,
+            exclude_dirs=[self.mutants_dir, self.config.scratch_dir], parallel=self.config.parallel_walk
+        )
+        source_paths = Parser.collect_c_cpp_files(self.source_args, **walk_options)
+        test_paths = Parser.collect_c_cpp_files(self.test_arg, **walk_options)
+        if self.config.project is not None:
+            self.config.project.exclude_tests(test_paths)
+        if self.config.smoke_suite:
+            smoke_tests = {os.path.abspath(p) for p in KillMatrix.read_smoke_suite(self.config.smoke_suite)}
+            test_paths = [p for p in test_paths if p in smoke_tests]
+        return source_paths, test_paths
+
     def collect_files(self) -> bool:
-        self.source_paths = Parser.collect_c_cpp_files(self.source_args)
+        self.source_paths, self.test_paths = self.collect_paths()
         if not self.source_paths:
             logger.error(f"No source files found in specified paths: {self.source_args}")
             return False
-
-        self.test_paths = Parser.collect_c_cpp_files(self.test_arg)
+        if self.config.smoke_suite:
+            logger.info(f"Restricted tests to the {len(self.test_paths)} test(s) of smoke suite {self.config.smoke_suite}.")
         if not self.test_paths:
             logger.error(f"No test source files found in {self.test_arg}")
             return False
 
         logger.info(f"Found {len(self.source_paths)} source file(s) and {len(self.test_paths)} test file(s).")
+        self.build_test_selection()
         return True
 
+    def build_test_selection(self):
+        """(Re)build the test index, and the symbol index with symbol-based selection, from the collected files."""
+        self.config.test_index = TestIndex(self.test_paths, self.config.test_map_rules)
+        if self.config.selection == SELECTION_SYMBOLS:
+            self.config.symbol_index = SymbolIndex.build(
+                self.source_paths, self.test_paths, os.path.join(self.mutants_dir, SYMBOL_OBJECTS_SUBDIR), self.config
+            )
+
     def run(self):
+        try:
+            self._run()
+        finally:
+            self.config.cleanup()
+
+    def _run(self):
+        start = time.perf_counter()
+        children_start = resource.getrusage(resource.RUSAGE_CHILDREN)
         if not self.collect_files():
             return
+        self.config.operator_set = Mutator.load_operator_set(self.config.operators)
 
         for source_path in self.source_paths:
-            with open(source_path, 'r') as f:
+            with open(source_path, 'r', newline='') as f:
                 source_code = f.read()
-            mutation_points = Parser.find_mutation_points(source_code)
+            with span('find_mutation_points', source=source_path):
+                mutation_points = Parser.find_mutation_points(source_code)
             if not mutation_points:
                 logger.info(f"No mutation points found in {source_path}.")
                 continue
 
             t, k, s, mutant_test_records = Mutator.process_mutants_for_source(
-                source_path, source_code, mutation_points, self.test_paths, self.mutants_dir
+                source_path, source_code, mutation_points, self.test_paths, self.mutants_dir, self.config
             )
             self.total += t
             self.killed += k
             self.survived += s
             self.all_mutant_test_records.extend(mutant_test_records)
 
+        minimal_tests = None
+        dominator_analysis = None
+        if self.config.kill_matrix is not None:
+            minimal_tests = self.config.kill_matrix.minimize()
+            self.config.kill_matrix.save(os.path.join(self.mutants_dir, KILL_MATRIX_FILE))
+            KillMatrix.save_smoke_suite(os.path.join(self.mutants_dir, SMOKE_SUITE_FILE), minimal_tests)
+            dominator_analysis = DominatorAnalysis.compute(self.config.kill_matrix, self.config.mutant_info)
+            stored = DominatorAnalysis.load(self.config.dominators_path)
+            stored.merge(dominator_analysis)
+            stored.save(self.config.dominators_path)
+
+        self.config.kill_stats.commit_run()
+        self.config.kill_stats.save(self.config.kill_stats_path)
+        self.config.results_writer.close()
+        logger.info(f"Mutant verdicts written to {self.config.results_path}.")
+        if self.config.junit_path:
+            write_junit(self.config.results_path, self.config.junit_path)
+            logger.info(f"JUnit XML written to {self.config.junit_path}.")
+
         Reporter.report_results(
             total=self.total,
             killed=self.killed,
             survived=self.survived,
-            mutant_test_records=self.all_mutant_test_records
+            mutant_test_records=self.all_mutant_test_records if self.config.details else None,
+            function_counts=self.config.function_counts if self.config.by_function else None,
+            killing_cases=self.config.killing_cases if self.config.case_protocol else None,
+            resources=(self.all_mutant_test_records, time.perf_counter() - start,
+                       MutationTester.cpu_seconds_since(children_start)) if self.config.resources else None,
+            unreachable=self.config.unreachable_mutants,
+            kill_matrix=self.config.kill_matrix,
+            minimal_tests=minimal_tests,
+            dominator_counts=dominator_analysis.counts() if dominator_analysis else None,
+            skipped_subsumed=self.config.skipped_subsumed,
+            operator_families=self.config.operator_family_counts,
+            cache_stats=self.config.artifact_cache.stats_snapshot() if self.config.artifact_cache else None,
+            selective=(self.config.kill_stats.stable_categories(), self.config.skipped_selective,
+                       self.config.saved_executions) if self.config.selective else None
         )
 
+    @staticmethod
+    def cpu_seconds_since(children_start) -> float:
+        """Return the user + system time of all child processes reaped since the given rusage."""
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return (children.ru_utime - children_start.ru_utime) + (children.ru_stime - children_start.ru_stime)
+
 def title():
     print(DOUBLE_DASH_LONG)
     print(f"{APP_NAME} {VERSION}: {DESCRIPTION}".center(106))
@@ -86,8 +237,12 @@ def main():
     logging.basicConfig(level=logging.INFO, format=LOGGING_FORMAT)
     title()
     args = MutationTester.parse_args()
-    tester = MutationTester(args.source, args.test, args.mut)
-    tester.run()
+    tester = MutationTester(args.source, args.test, args.mut, MutationConfig.from_args(args))
+    if args.mode == MODE_WATCH:
+        logging.getLogger().setLevel(logging.WARNING)
+        Watcher(tester, args.watch_interval).run()
+    else:
+        tester.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+# metrics.py
+"""
+Module for exposing live run metrics in OpenMetrics text format.
+
+Counters and histograms are updated from the mutation loop (as a verdict listener and as the
+observer of the progress tracker's build/test phases); cache and queue figures are read from the
+artifact cache and the progress tracker when the metrics are rendered. They are served on a
+local HTTP endpoint for Prometheus to scrape, and/or written to a file for the node_exporter
+textfile collector. The textfile uses the Prometheus text format, where a counter family is named
+after its '_total' sample, and is rewritten at most every status_interval seconds. Nothing here is
+created unless one of the two outputs is requested.
+"""
+
+import os
+import time
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from mutant_store import MutantVerdict
+from artifact_cache import write_atomic
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+class Histogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, help_text: str) -> List[str]:
+        lines = [f"# TYPE {name} histogram", f"# HELP {name} {help_text}"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.sum:.6f}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+class Metrics:
+    def __init__(self, config, textfile_path: Optional[str] = None):
+        """:param config: The run's MutationConfig, read for the progress tracker and the artifact cache."""
+        self.config = config
+        self.textfile_path = textfile_path
+        self.mutants = 0
+        self.killed = 0
+        self.survived = 0
+        self.phases: Dict[str, Histogram] = {
+            'build': Histogram(METRICS_SECONDS_BUCKETS), 'test': Histogram(METRICS_SECONDS_BUCKETS)
+        }
+        self._lock = threading.Lock()
+        self._last_textfile = 0.0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def __call__(self, verdict: MutantVerdict):
+        with self._lock:
+            self.mutants += 1
+            if verdict.killed:
+                self.killed += 1
+            else:
+                self.survived += 1
+        now = time.perf_counter()
+        if self.textfile_path and now - self._last_textfile >= self.config.status_interval:
+            self._last_textfile = now
+            self.write_textfile()
+
+    def observe_phase(self, phase: str, seconds: float):
+        with self._lock:
+            self.phases[phase].observe(seconds)
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Render in OpenMetrics format, or in the Prometheus text format (openmetrics=False)."""
+        def counter(name: str, help_text: str) -> List[str]:
+            family = name if openmetrics else f"{name}_total"
+            return [f"# TYPE {family} counter", f"# HELP {family} {help_text}"]
+
+        with self._lock:
+            lines = []
+            for name, value, help_text in (
+                ('utmuter_mutants', self.mutants, 'Mutants with a verdict'),
+                ('utmuter_mutants_killed', self.killed, 'Mutants killed by at least one test or build failure'),
+                ('utmuter_mutants_survived', self.survived, 'Mutants that survived all their tests'),
+            ):
+                lines += counter(name, help_text) + [f"{name}_total {value}"]
+            lines += self.phases['build'].render('utmuter_build_seconds', 'Wall time of mutant compile and link steps')
+            lines += self.phases['test'].render('utmuter_test_seconds', 'Wall time of test binary runs')
+        cache = self.config.artifact_cache
+        if cache is not None:
+            cache_stats = cache.stats_snapshot()
+            lines += counter('utmuter_cache_hits', 'Artifact cache hits')
+            for kind, (local_hits, remote_hits, _) in sorted(cache_stats.items()):
+                lines.append(f'utmuter_cache_hits_total{{kind="{kind}",tier="local"}} {local_hits}')
+                lines.append(f'utmuter_cache_hits_total{{kind="{kind}",tier="remote"}} {remote_hits}')
+            lines += counter('utmuter_cache_misses', 'Artifact cache misses')
+            for kind, (_, _, misses) in sorted(cache_stats.items()):
+                lines.append(f'utmuter_cache_misses_total{{kind="{kind}"}} {misses}')
+        progress = self.config.progress
+        lines += ["# TYPE utmuter_queue_depth gauge",
+                  "# HELP utmuter_queue_depth Mutants waiting to run (pending) and steps in progress per stage"]
+        lines.append(f'utmuter_queue_depth{{stage="pending"}} {max(progress.planned - progress.done, 0)}')
+        for phase in ('build', 'test'):
+            lines.append(f'utmuter_queue_depth{{stage="{phase}"}} {progress.in_flight.get(phase, 0)}')
+        executor = self.config.executor
+        if executor is not None:
+            lines += ["# TYPE utmuter_concurrency_limit gauge",
+                      "# HELP utmuter_concurrency_limit Builds/tests allowed to run at once per stage"]
+            for stage, limit in executor.controller.limits.items():
+                lines.append(f'utmuter_concurrency_limit{{stage="{stage}"}} {limit}')
+        return '\n'.join(lines) + ('\n# EOF\n' if openmetrics else '\n')
+
+    def write_textfile(self):
+        write_atomic(os.path.abspath(self.textfile_path), self.render(openmetrics=False).encode())
+
+    def serve(self, host: str, port: int):
+        """Serve the metrics on http://host:port/metrics from a background thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def close(self):
+        if self.textfile_path:
+            self.write_textfile()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
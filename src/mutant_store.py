@@ -0,0 +1,156 @@
+# mutant_store.py
+"""
+Module for storing mutants as compact patches instead of full source copies.
+
+Every mutant is one line in a single index file:
+    <mutant name> TAB <source hash> TAB <offset> TAB <old text> TAB <new text>
+and every source the patches refer to is declared once with:
+    @source TAB <source hash> TAB <source path>
+Backslashes, tabs and line breaks in the old and new texts are written as \\\\, \\t, \\n and \\r.
+The full mutant text is only materialized when a mutant is built or explicitly requested.
+"""
+
+import os
+import re
+import sys
+import hashlib
+import argparse
+import logging
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+class MutantPatch(NamedTuple):
+    file_hash: str
+    offset: int
+    old: str
+    new: str
+
+class MutantVerdict(NamedTuple):
+    """The outcome of one mutant, handed to the verdict listeners as soon as it is known."""
+    name: str
+    mutant_id: str
+    source_path: str
+    function: str
+    line: int
+    column: int
+    old: str
+    new: str
+    killed: bool
+    killing_tests: List[str]
+    tests: List[str]
+    # Failed test cases per killing test, when a test case protocol is used
+    killing_cases: Optional[Dict[str, List[str]]] = None
+    # Output line that stopped each killing test early, when an abort pattern is used
+    abort_lines: Optional[Dict[str, str]] = None
+
+_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_UNESCAPES = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+
+def escape_field(text: str) -> str:
+    """Escape a text so it fits in one tab-separated field of the index."""
+    return text.translate(str.maketrans(_ESCAPES))
+
+def unescape_field(field: str) -> str:
+    return re.sub(r'\\(.)', lambda m: _UNESCAPES.get(m.group(1), m.group(0)), field)
+
+def source_hash(source_code: str) -> str:
+    """Return the short content hash identifying a source file version."""
+    return hashlib.sha1(source_code.encode()).hexdigest()[:16]
+
+def materialize(source_code: str, patch: MutantPatch) -> str:
+    """Return the full mutant text for a patch applied to the source it was created from."""
+    end = patch.offset + len(patch.old)
+    if source_code[patch.offset:end] != patch.old:
+        raise ValueError(f"Patch does not apply at offset {patch.offset}: expected '{patch.old}'")
+    return source_code[:patch.offset] + patch.new + source_code[end:]
+
+class MutantIndex:
+    """Append-only index file holding one patch record per mutant."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.known_sources: Dict[str, str] = {}
+        self._file: Optional[TextIO] = open(path, 'w')
+
+    def add_source(self, source_path: str, file_hash: str):
+        """Declare a source file once, before its first patch."""
+        if file_hash not in self.known_sources:
+            self.known_sources[file_hash] = source_path
+            self._file.write(f"{INDEX_SOURCE_TAG}\t{file_hash}\t{os.path.abspath(source_path)}\n")
+
+    def add(self, mutant_name: str, patch: MutantPatch):
+        """Append the record of one mutant."""
+        self._file.write(f"{mutant_name}\t{patch.file_hash}\t{patch.offset}\t"
+                         f"{escape_field(patch.old)}\t{escape_field(patch.new)}\n")
+
+    def flush(self):
+        """Make the records written so far readable, e.g. after a watch cycle."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def read(path: str) -> Tuple[Dict[str, str], Iterator[Tuple[str, MutantPatch]]]:
+        """
+        Read an index file.
+        :return: The source paths by hash, and a lazy iterator of (mutant name, patch) records.
+        """
+        sources: Dict[str, str] = {}
+        with open(path, 'r') as f:
+            for line in f:
+                if line.startswith(INDEX_SOURCE_TAG + '\t'):
+                    _, file_hash, source_path = line.rstrip('\n').split('\t', 2)
+                    sources[file_hash] = source_path
+        return sources, MutantIndex._iter_records(path)
+
+    @staticmethod
+    def _iter_records(path: str) -> Iterator[Tuple[str, MutantPatch]]:
+        with open(path, 'r') as f:
+            for line in f:
+                if line.startswith(INDEX_SOURCE_TAG + '\t'):
+                    continue
+                name, file_hash, offset, old, new = line.rstrip('\n').split('\t')
+                yield name, MutantPatch(file_hash, int(offset), unescape_field(old), unescape_field(new))
+
+    @staticmethod
+    def materialize_mutant(path: str, mutant_name: str) -> str:
+        """
+        Materialize the full text of a single mutant from an index file. When a mutant was recorded
+        several times (watch mode re-runs a function after each change), the last record is used.
+        """
+        sources, records = MutantIndex.read(path)
+        patch = None
+        for name, record in records:
+            if name == mutant_name:
+                patch = record
+        if patch is not None:
+            with open(sources[patch.file_hash], 'r', newline='') as f:
+                source_code = f.read()
+            if source_hash(source_code) != patch.file_hash:
+                raise ValueError(f"Source {sources[patch.file_hash]} changed since the mutant was recorded.")
+            return materialize(source_code, patch)
+        raise KeyError(f"Mutant {mutant_name} not found in {path}")
+
+def main(argv: Optional[List[str]] = None):
+    """Command line helper: print or write one mutant from an index file."""
+    parser = argparse.ArgumentParser(description="Materialize a mutant from a UTMuter mutant index")
+    parser.add_argument('index', help=f'Path to the mutant index file ({MUTANT_INDEX_FILE})')
+    parser.add_argument('mutant', help='Mutant name, e.g. mutant_example_add_0')
+    parser.add_argument('-o', '--output', help='Write the mutant to this file instead of stdout')
+    args = parser.parse_args(argv)
+    mutant_code = MutantIndex.materialize_mutant(args.index, args.mutant)
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            f.write(mutant_code)
+    else:
+        sys.stdout.write(mutant_code)
+
+if __name__ == "__main__":
+    main()
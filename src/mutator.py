@@ -4,12 +4,23 @@ Module for applying mutations to C/C++ source code.
 """
 
 import os
+import json
 import logging
-from typing import List, Tuple, Dict, Any
+from collections import deque
+from typing import List, Tuple, Dict, Any, Optional
 
 from parser import Parser
 from builder import Builder
 from tester import Tester
+from config import MutationConfig
+from preprocessor import PreprocessedSource
+from mutant_store import MutantPatch, MutantVerdict, source_hash
+from test_index import TestIndex
+from reachability import Reachability
+from record_store import RecordStore, RecordUsage
+from process_usage import collect_usage
+from tracing import span
+from dominators import stable_mutant_id, function_key
 from constants import *
 
 logger = logging.getLogger(__name__)
@@ -21,95 +32,526 @@ class Mutator:
         '&&': '||', '||': '&&'
     }
 
+    # Operator family of each operator, for per-family counts (AOR, ROR, LCR).
+    OPERATOR_FAMILIES: Dict[str, str] = {
+        '+': 'arithmetic', '-': 'arithmetic', '*': 'arithmetic', '/': 'arithmetic',
+        '==': 'relational', '!=': 'relational', '>': 'relational', '<': 'relational', '>=': 'relational', '<=': 'relational',
+        '&&': 'logical', '||': 'logical'
+    }
+
+    # Minimal sufficient ROR/LCR replacements: each set subsumes the remaining replacements of its
+    # operator, so it yields the same mutation score with fewer mutants. 'false'/'true' replace the
+    # whole comparison, 'lhs'/'rhs' replace a logical expression by one of its operands, and '=='/'!='
+    # of a logical connector compare the truth values of its operands.
+    SUFFICIENT_OPERATORS: Dict[str, List[str]] = {
+        '+': ['-'], '-': ['+'], '*': ['/'], '/': ['*'],
+        '<': ['<=', '!=', 'false'], '>': ['>=', '!=', 'false'],
+        '<=': ['<', '==', 'true'], '>=': ['>', '==', 'true'],
+        '==': ['<=', '>=', 'false'], '!=': ['<', '>', 'true'],
+        '&&': ['lhs', 'rhs', 'false', '=='], '||': ['lhs', 'rhs', 'true', '!=']
+    }
+
     @staticmethod
-    def apply_single_mutation(source_code: str, mutation_point: Tuple[int, int, str]) -> str:
-        """Applies a single mutation to the source code at the given mutation point."""
-        lines = source_code.splitlines()
+    def load_operator_set(name: str) -> Dict[str, List[str]]:
+        """
+        Return the replacements per operator of a named operator set ('default', 'sufficient') or of a
+        JSON file mapping operators to lists of replacements. Operators missing from a file are not mutated.
+        """
+        if name == OPERATORS_DEFAULT:
+            return {op: [new] for op, new in Mutator.MUTATION_OPERATORS_MAP.items()}
+        if name == OPERATORS_SUFFICIENT:
+            return dict(Mutator.SUFFICIENT_OPERATORS)
+        with open(name, 'r') as f:
+            operator_set = json.load(f)
+        for op in [op for op in operator_set if op not in Mutator.MUTATION_OPERATORS_MAP]:
+            logger.warning(f"Operator '{op}' in {name} is not a mutation point operator. Ignoring it.")
+            del operator_set[op]
+        return operator_set
+
+    @staticmethod
+    def resolve_mutation(source_lines: List[str], mutation_point: Tuple[int, int, str],
+                         replacement: str) -> Optional[Tuple[int, int, str, str]]:
+        """
+        Turn a mutation point and one replacement into a concrete (line, column, old text, new text) edit.
+        Expression replacements (see EXPRESSION_REPLACEMENTS) cover the operands found by
+        Parser.find_operand_span; None is returned when they cannot be delimited on the line.
+        '=='/'!=' replacing '&&'/'||' become '((!!(lhs)) == (!!(rhs)))', since '==' binds tighter than
+        the connector and compares values, not truth values.
+        """
         idx, col, op = mutation_point
-        line = lines[idx]
-        if line[col:col+len(op)] == op and op in Mutator.MUTATION_OPERATORS_MAP:
-            mutated_op = Mutator.MUTATION_OPERATORS_MAP[op]
-            lines[idx] = line[:col] + mutated_op + line[col+len(op):]
-        return '\n'.join(lines)
+        truth_comparison = op in LOGICAL_OPERATORS and replacement in TRUTH_COMPARISONS
+        if replacement not in EXPRESSION_REPLACEMENTS and not truth_comparison:
+            return (idx, col, op, replacement)
+        span = Parser.find_operand_span(source_lines, idx, col, op)
+        if span is None:
+            return None
+        begin, end = span
+        line = source_lines[idx]
+        if replacement == 'lhs':
+            new = f"({line[begin:col].strip()})"
+        elif replacement == 'rhs':
+            new = f"({line[col + len(op):end].strip()})"
+        elif truth_comparison:
+            new = f"((!!({line[begin:col].strip()})) {replacement} (!!({line[col + len(op):end].strip()})))"
+        else:
+            new = EXPRESSION_REPLACEMENTS[replacement]
+        return (idx, begin, line[begin:end], new)
+
+    @staticmethod
+    def apply_single_mutation(source_code: str, mutation_point: Tuple,
+                              line_offsets: Optional[List[int]] = None) -> str:
+        """
+        Applies a single mutation to the source code at the given mutation point.
+        The mutant is built as prefix + new text + suffix of the original string, so everything apart
+        from the mutated text (line endings, trailing newline) is kept byte-exact.
+        :param mutation_point: (line, column, op), replaced with MUTATION_OPERATORS_MAP[op], or a
+                               resolved (line, column, old text, new text) edit.
+        :param line_offsets: Precomputed Parser.line_offsets(source_code); pass it when generating
+                             many mutants of the same source to avoid rescanning it per mutant.
+        """
+        if line_offsets is None:
+            line_offsets = Parser.line_offsets(source_code)
+        idx, col, old = mutation_point[:3]
+        new = mutation_point[3] if len(mutation_point) == 4 else Mutator.MUTATION_OPERATORS_MAP.get(old)
+        offset = line_offsets[idx] + col
+        if source_code[offset:offset+len(old)] == old and new is not None:
+            return source_code[:offset] + new + source_code[offset+len(old):]
+        return source_code
+
+    @staticmethod
+    def make_patch(file_hash: str, line_offsets: List[int], mutation_point: Tuple) -> MutantPatch:
+        """Describes a mutation point or resolved edit as a compact (file hash, offset, old, new) patch."""
+        idx, col, old = mutation_point[:3]
+        new = mutation_point[3] if len(mutation_point) == 4 else Mutator.MUTATION_OPERATORS_MAP.get(old, old)
+        return MutantPatch(file_hash, line_offsets[idx] + col, old, new)
+
+    @staticmethod
+    def expand_mutations(source_lines: List[str], mutation_points: List[Tuple[int, int, str]],
+                         operator_set: Dict[str, List[str]]) -> List[Tuple[Tuple[int, int, str], Tuple[int, int, str, str]]]:
+        """Return a (mutation point, edit) pair for every replacement of every point in the operator set."""
+        mutations = []
+        for point in mutation_points:
+            for replacement in operator_set.get(point[2], []):
+                edit = Mutator.resolve_mutation(source_lines, point, replacement)
+                if edit is None:
+                    logger.debug(f"Operands of '{point[2]}' at line {point[0] + 1}:{point[1] + 1} not delimited on one line. "
+                                 f"Skipping replacement '{replacement}'.")
+                    continue
+                mutations.append((point, edit))
+        return mutations
+
+    @staticmethod
+    def log_operator_plan(source_path: str, func_mutations: Dict[str, list]):
+        """Log the number of planned mutants per operator family for a source in a single message."""
+        counts: Dict[str, int] = {}
+        for mutations in func_mutations.values():
+            for point, _ in mutations:
+                family = Mutator.OPERATOR_FAMILIES[point[2]]
+                counts[family] = counts.get(family, 0) + 1
+        logger.info(f"Mutation plan for {source_path}: " +
+                    (', '.join(f"{family} {count}" for family, count in sorted(counts.items())) or 'no mutants'))
 
     @staticmethod
     def generate_combined_mutants(source_code, mutation_points):
-        """Generate a single string containing all mutants, each separated and annotated."""
-        combined = []
+        """Lazily yield every mutant, each separated and annotated, one mutant at a time."""
+        line_offsets = Parser.line_offsets(source_code)
         for idx, point in enumerate(mutation_points):
-            mutant_code = Mutator.apply_single_mutation(source_code, point)
-            combined.append(f"// ---- Mutant {idx+1} ----\n" + mutant_code + "\n// ---- End Mutant {idx+1} ----\n")
-        return '\n'.join(combined)
+            if idx:
+                yield '\n'
+            mutant_code = Mutator.apply_single_mutation(source_code, point, line_offsets)
+            yield f"// ---- Mutant {idx+1} ----\n" + mutant_code + "\n// ---- End Mutant {idx+1} ----\n"
 
     @staticmethod
-    def process_mutants_for_source(source_path, source_code, mutation_points, test_paths, mutants_dir):
-        """Process all mutants for a given source file."""
+    def write_combined_mutants(source_code, mutation_points, stream):
+        """Stream all annotated mutants to a writable text stream without holding them in memory together."""
+        for chunk in Mutator.generate_combined_mutants(source_code, mutation_points):
+            stream.write(chunk)
+
+    @staticmethod
+    def build_mutant_for_test(mutant_path, test_path, binary_path, source_path, config=None, mutant_object=None,
+                              mutant_code=None):
+        """
+        Builds the binary for one mutant/test pair.
+        Without a project the mutant and the test are compiled and linked together. With a project the
+        precompiled mutant object is linked against the test and the cached objects of the unmodified
+        translation units. In in-memory mode the mutant text is piped to the compiler instead of read from disk.
+        :return: True if the build succeeded, False if it failed, None if the unmodified parts could not be built
+                 or linked. A link failure is not the mutant's doing: its object already compiled.
+        """
+        if config is None or config.project is None:
+            if config is not None and config.in_memory:
+                flags = ['-iquote', os.path.dirname(os.path.abspath(source_path))]
+                return Builder.build_from_stdin(mutant_code, Builder.stdin_language(mutant_path), binary_path,
+                                                [test_path], flags=flags)
+            return Builder.build_sources([mutant_path, test_path], binary_path)
+        project = config.project
+        test_object = config.object_cache.object_for(test_path, flags_from=source_path)
+        link_objects = config.object_cache.objects_for(project.link_units_for(source_path, test_path))
+        if test_object is None or link_objects is None:
+            return None
+        if not Builder.link_objects([mutant_object, test_object] + link_objects, binary_path,
+                                    project.compiler, project.link_flags):
+            return None
+        return True
+
+    @staticmethod
+    def compile_mutant_object(mutant_path, object_path, source_path, config, mutant_code=None):
+        """Compiles the mutated translation unit once with the flags of its original source."""
+        project = config.project
+        flags = project.flags_for(source_path) + ['-iquote', os.path.dirname(os.path.abspath(source_path))]
+        if os.path.splitext(mutant_path)[1] in ('.i', '.ii'):
+            flags.append('-fpreprocessed')
+        if config.in_memory:
+            return Builder.build_from_stdin(mutant_code, Builder.stdin_language(mutant_path), os.path.abspath(object_path),
+                                            compiler=project.compiler, flags=flags, compile_only=True,
+                                            cwd=project.directory_for(source_path))
+        return Builder.compile_object(os.path.abspath(mutant_path), os.path.abspath(object_path), project.compiler, flags,
+                                      cwd=project.directory_for(source_path))
+
+    @staticmethod
+    def remove_build_artifacts(*paths):
+        """Deletes mutant binaries and objects once the mutant's verdict is known."""
+        for path in paths:
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def build_inputs(source_path, test_path, config) -> List[str]:
+        """Return the compiler, flags and link unit contents a mutant build of this source/test pair depends on."""
+        project = config.project
+        if project is None:
+            return ['gcc']
+        cache = config.artifact_cache
+        link_units = [cache.file_hash(path) for path in project.link_units_for(source_path, test_path)] if test_path else []
+        return [project.compiler] + project.flags_for(source_path) + project.link_flags + link_units
+
+    @staticmethod
+    def obtain_mutant_object(mutant_base, mutant_path, mutant_object, source_path, config, mutant_code):
+        """Compiles the mutant object, or copies it from the artifact cache when it was built before."""
+        cache = config.artifact_cache
+        key = cache.key('object', mutant_code, *Mutator.build_inputs(source_path, None, config)) if cache else None
+        data = cache.get('object', key) if cache else None
+        if data is not None:
+            logger.info(f"Cached object... [Mutant {mutant_base}]")
+            with open(mutant_object, 'wb') as f:
+                f.write(data)
+            return True
+        logger.info(f"Compiling... [Mutant {mutant_base}]")
+        if not Mutator.compile_mutant_object(mutant_path, mutant_object, source_path, config, mutant_code):
+            return False
+        if cache:
+            with open(mutant_object, 'rb') as f:
+                cache.put('object', key, f.read())
+        return True
+
+    @staticmethod
+    def run_mutant_tests(mutant_base, mutant_path, mutant_code, source_path, relevant_tests, config, mutant_test_records,
+                         function=None, killing_cases=None, abort_lines=None):
+        """
+        Builds and tests one mutant against its relevant tests, appending a record per executed test.
+        Stops at the first killing test, unless the full kill matrix is recorded. With an artifact cache,
+        verdicts of identical mutant/test builds are reused and the mutant is only built when one is missing.
+        Each record carries the resource usage of its build and test processes; the mutant object's
+        compilation is attributed to the first record built from it. Every build and test step holds a
+        slot of its stage, so the executor's concurrency controller limits parallel builds and tests.
+        With a test case protocol only the cases selected for the function run, and the failed cases of
+        each killing test are stored in killing_cases. With an abort pattern a test is stopped at its first
+        matching output line, which is stored in abort_lines.
+        :return: The tests that killed the mutant (build failures count as kills).
+        """
+        full_matrix = config.kill_matrix is not None
+        cache = config.artifact_cache
+        killing_tests = []
+        mutant_object = None
+        object_usage = []
+        binary_path = os.path.join(config.scratch_dir, f"{mutant_base}")
+        for i, test_path in enumerate(relevant_tests):
+            test_base = os.path.splitext(os.path.basename(test_path))[0]
+            verdict_key = cache.key('verdict', mutant_code, cache.file_hash(test_path),
+                                    *Mutator.build_inputs(source_path, test_path, config),
+                                    *Mutator.verdict_inputs(function, config)) if cache else None
+            cached = cache.get('verdict', verdict_key) if cache else None
+            if cached is not None:
+                verdict, failed_cases, abort_line = Mutator.decode_verdict(cached)
+                logger.info(f"[Mutant {mutant_base} | Test {test_base}] Cached verdict: {verdict}.")
+                mutant_test_records.append((mutant_path, test_path, verdict, source_path))
+                if failed_cases and killing_cases is not None:
+                    killing_cases[test_path] = failed_cases
+                if abort_line is not None and abort_lines is not None:
+                    abort_lines[test_path] = abort_line
+                if verdict == "killed":
+                    killing_tests.append(test_path)
+                    if not full_matrix:
+                        break
+                continue
+            if config.project is not None and mutant_object is None:
+                mutant_object = os.path.join(config.scratch_dir, f"{mutant_base}.o")
+                with config.executor.slot('build'), config.progress.timed('build'), \
+                     span('compile_mutant', source=source_path, mutant=mutant_base), collect_usage() as object_usage:
+                    object_ok = Mutator.obtain_mutant_object(mutant_base, mutant_path, mutant_object, source_path, config, mutant_code)
+                if not object_ok:
+                    logger.warning(f"[Pass] [Mutant {mutant_base}] Compilation failed. Counting as killed.")
+                    failed_tests = relevant_tests[i:] if full_matrix else [test_path]
+                    killing_tests.extend(failed_tests)
+                    mutant_test_records.append((mutant_path, test_path, "killed", source_path), RecordUsage.of(object_usage, []))
+                    mutant_test_records.extend((mutant_path, t, "killed", source_path) for t in failed_tests[1:])
+                    break
+            logger.info(f"Building... [Mutant {mutant_base}]")
+            test_usage = []
+            failed_cases = []
+            abort_line = None
+            with config.executor.slot('build'), config.progress.timed('build'), \
+                 span('build', source=source_path, mutant=mutant_base, test=test_path), collect_usage() as build_usage:
+                build_ok = Mutator.build_mutant_for_test(mutant_path, test_path, binary_path, source_path,
+                                                         config, mutant_object, mutant_code)
+            if build_ok is None:
+                logger.error(f"[Mutant {mutant_base} | Test {test_base}] Unmodified project units failed to build or link. Skipping test.")
+                continue
+            if not build_ok:
+                logger.warning(f"[Pass] [Mutant {mutant_base} | Test {test_base}] Build failed. Counting as killed.")
+                verdict = "killed"
+            else:
+                logger.info(f"Build Success")
+                logger.info(f"Testing...")
+                with config.executor.slot('test'), config.progress.timed('test'), \
+                     span('test', source=source_path, mutant=mutant_base, test=test_path), collect_usage() as test_usage:
+                    if config.case_protocol is not None:
+                        result, failed_cases, abort_line = Tester.run_test_cases(binary_path, config.case_protocol,
+                                                                                 function, config.abort_pattern)
+                    elif config.abort_pattern is not None:
+                        result, failed_cases, abort_line = Tester.run_tests_until(binary_path, config.abort_pattern)
+                    else:
+                        result = Tester.run_tests(binary_path)
+                if not result:
+                    killed_by = f" by case(s) {', '.join(failed_cases)}" if failed_cases else ""
+                    stopped_at = f" Stopped at: {abort_line}" if abort_line is not None else ""
+                    logger.info(f"[Pass] [Mutant {mutant_base} | Test {test_base}] Killed{killed_by}.{stopped_at}")
+                    verdict = "killed"
+                else:
+                    logger.error(f"[Fail] [Mutant {mutant_base} | Test {test_base}] Survived this test.")
+                    verdict = "survived"
+            mutant_test_records.append((mutant_path, test_path, verdict, source_path),
+                                       RecordUsage.of(object_usage + build_usage, test_usage))
+            object_usage = []
+            if failed_cases and killing_cases is not None:
+                killing_cases[test_path] = failed_cases
+            if abort_line is not None and abort_lines is not None:
+                abort_lines[test_path] = abort_line
+            if cache:
+                cache.put('verdict', verdict_key, Mutator.encode_verdict(verdict, failed_cases, abort_line))
+            if verdict == "killed":
+                killing_tests.append(test_path)
+                if not full_matrix:
+                    break
+        Mutator.remove_build_artifacts(binary_path, mutant_object, None if config.keep_mutants else mutant_path)
+        return killing_tests
+
+    @staticmethod
+    def verdict_inputs(function, config) -> List[str]:
+        """Return the test settings a verdict depends on: the case protocol and function, and the abort pattern."""
+        inputs = []
+        if config.case_protocol is not None:
+            inputs += [config.case_protocol.name, function or '']
+        if config.abort_pattern is not None:
+            inputs.append(config.abort_pattern.pattern)
+        return inputs
+
+    @staticmethod
+    def encode_verdict(verdict: str, failed_cases: List[str], abort_line: Optional[str]) -> bytes:
+        """A cached verdict is the plain verdict, or JSON when it has failed cases or an abort line."""
+        if not failed_cases and abort_line is None:
+            return verdict.encode()
+        return json.dumps({'verdict': verdict, 'cases': failed_cases, 'abort_line': abort_line}).encode()
+
+    @staticmethod
+    def decode_verdict(data: bytes) -> Tuple[str, List[str], Optional[str]]:
+        text = data.decode()
+        if not text.startswith('{'):
+            return text, [], None
+        entry = json.loads(text)
+        return entry['verdict'], entry['cases'], entry['abort_line']
+
+    @staticmethod
+    def run_mutant_job(mutant_base, mutant_path, mutant_code, source_path, func_name, relevant_tests, config):
+        """
+        Runs one mutant, possibly on an executor worker. Its records go to a private store that the caller
+        merges in submission order.
+        :return: The killing tests, the failed cases and abort lines per killing test and the mutant's records.
+        """
+        records = RecordStore()
+        killing_cases = {}
+        abort_lines = {}
+        with span('mutant', source=source_path, function=func_name, mutant=mutant_base):
+            killing_tests = Mutator.run_mutant_tests(mutant_base, mutant_path, mutant_code, source_path, relevant_tests,
+                                                     config, records, func_name, killing_cases, abort_lines)
+        return killing_tests, killing_cases, abort_lines, records
+
+    @staticmethod
+    def preprocess_source_once(source_path, mutants_dir, config):
+        """Runs the preprocessor once for a source file, using the project flags when available."""
+        base_name = os.path.splitext(os.path.basename(source_path))[0]
+        output_path = os.path.join(mutants_dir, f"{base_name}{PreprocessedSource.output_extension(source_path)}")
+        if config.project is not None:
+            return PreprocessedSource.preprocess(source_path, output_path, config.project.compiler,
+                                                 config.project.flags_for(source_path),
+                                                 cwd=config.project.directory_for(source_path))
+        return PreprocessedSource.preprocess(source_path, output_path)
+
+    @staticmethod
+    def process_mutants_for_source(source_path, source_code, mutation_points, test_paths, mutants_dir, config=None,
+                                   functions=None):
+        """
+        Process all mutants for a given source file.
+        Mutants are prepared here and run on the config's executor, several at once when it has more than one
+        worker; their verdicts are recorded and reported here in the original order.
+        :param functions: Only process the mutants of these functions (default: all functions).
+        """
+        if config is not None:
+            return Mutator._process_mutants_for_source(source_path, source_code, mutation_points, test_paths,
+                                                       mutants_dir, config, functions)
+        config = MutationConfig()
+        config.prepare(mutants_dir)
+        try:
+            return Mutator._process_mutants_for_source(source_path, source_code, mutation_points, test_paths,
+                                                       mutants_dir, config, functions)
+        finally:
+            config.cleanup()
+
+    @staticmethod
+    def _process_mutants_for_source(source_path, source_code, mutation_points, test_paths, mutants_dir, config,
+                                    functions):
         total = killed = survived = 0
-        mutant_test_records = []
+        mutant_test_records = RecordStore(config.record_paths)
         source_lines = source_code.splitlines()
         base_name = os.path.splitext(os.path.basename(source_path))[0]
-        matching_tests = Parser.find_matching_tests(test_paths, base_name)
-        print(f"{SHORT_DASH} Processing source file {SHORT_DASH}")
+        selector = config.symbol_index or config.test_index or TestIndex(test_paths)
+        with span('group_mutation_points_by_function', source=source_path):
+            func_mut_points = Parser.group_mutation_points_by_function(mutation_points, source_lines)
+        matching_tests, func_tests = selector.select_tests(source_path, list(func_mut_points))
+        config.progress.print_line(f"{SHORT_DASH} Processing source file {SHORT_DASH}")
         logger.info(f"Source file: {source_path}")
-        logger.info(f"Matching test files for source: \n {matching_tests}")
         if not matching_tests:
-            logger.debug(f"No matching test files found for source {source_path}. Skipping.")
+            logger.info(f"No matching test files found for source {source_path}. Skipping.")
             return total, killed, survived, mutant_test_records
+        TestIndex.log_mapping(source_path, matching_tests, func_tests)
+        operator_set = config.operator_set or Mutator.load_operator_set(config.operators)
+        unreachable = set()
+        if config.prune_unreachable:
+            work_dir = os.path.join(config.scratch_dir, REACHABILITY_SUBDIR)
+            unreachable = Reachability.unreachable_functions(source_path, matching_tests, work_dir, config)
+            pruned = [(func_name, len(Mutator.expand_mutations(source_lines, points, operator_set)))
+                      for func_name, points in func_mut_points.items() if func_name in unreachable]
+            if pruned:
+                logger.info(f"Unreachable functions in {source_path} (mutants not built):\n" +
+                            '\n'.join(f"  {func_name}: {count} mutant(s)" for func_name, count in pruned))
+                config.unreachable_mutants.extend((source_path, func_name, count) for func_name, count in pruned)
+
+        file_hash = source_hash(source_code)
+        line_offsets = Parser.line_offsets(source_code)
+        config.mutant_index.add_source(source_path, file_hash)
+        preprocessed = Mutator.preprocess_source_once(source_path, mutants_dir, config) if config.preprocess else None
+
+        func_mutations = {
+            func_name: Mutator.expand_mutations(source_lines, points, operator_set)
+            for func_name, points in func_mut_points.items()
+            if func_tests[func_name] and func_name not in unreachable and (functions is None or func_name in functions)
+        }
+        Mutator.log_operator_plan(source_path, func_mutations)
+        config.progress.plan(sum(len(mutations) for mutations in func_mutations.values()))
+
+        pending = deque()
 
-        func_mut_points = Parser.group_mutation_points_by_function(mutation_points, source_lines)
+        def finish(future, mutant_base, mutant_id, point, patch, func_name, func_key, func_hash, relevant_tests):
+            nonlocal total, killed, survived
+            killing_tests, killing_cases, abort_lines, records = future.result()
+            mutant_test_records.extend(records)
+            line_idx, col, op = point
+            family = Mutator.OPERATOR_FAMILIES[op]
+            mutant_killed = bool(killing_tests)
+            config.kill_stats.record(func_key, op, mutant_killed, len(records))
+            verdict = MutantVerdict(mutant_base, mutant_id, source_path, func_name, line_idx + 1, col + 1,
+                                    patch.old, patch.new, mutant_killed, killing_tests, relevant_tests, killing_cases,
+                                    abort_lines)
+            if killing_cases:
+                config.killing_cases[mutant_base] = killing_cases
+            for listener in config.verdict_listeners:
+                listener(verdict)
+            if config.kill_matrix is not None:
+                config.kill_matrix.add(mutant_id, relevant_tests, killing_tests)
+                config.mutant_info[mutant_id] = {
+                    'name': mutant_base, 'function_key': func_key, 'function_hash': func_hash, 'operator': op
+                }
+            config.progress.print_line(LONG_DASH)
+
+            total += 1
+            family_counts = config.operator_family_counts.setdefault(family, [0, 0])
+            family_counts[0] += 1
+            function_counts = config.function_counts.setdefault((source_path, func_name), [0, 0])
+            function_counts[0] += 1
+            if mutant_killed:
+                killed += 1
+                family_counts[1] += 1
+                function_counts[1] += 1
+            else:
+                survived += 1
 
         for func_name, points in func_mut_points.items():
-            relevant_tests = [
-                test_path for test_path in matching_tests
-                if func_name in os.path.splitext(os.path.basename(test_path))[0]
-            ]
-            logger.info(f"Relevant test files for function '{func_name}':\n {relevant_tests}")
-            print(LONG_DASH)
-            if not relevant_tests:
-                logger.debug(f"No relevant test files found for function {func_name} in source {source_path}. Skipping mutants for this function.")
+            relevant_tests = func_tests[func_name]
+            config.progress.print_line(LONG_DASH)
+            if func_name not in func_mutations:
                 continue
-            for i, point in enumerate(points):
+            func_start, func_hash = Parser.function_fingerprint(source_lines, points[0][0])
+            func_key = function_key(source_path, func_name)
+            mutants = []
+            for point, edit in func_mutations[func_name]:
+                patch = Mutator.make_patch(file_hash, line_offsets, edit)
+                mutant_id = stable_mutant_id(os.path.basename(source_path), func_name, func_hash,
+                                             patch.offset - line_offsets[func_start], patch.old, patch.new)
+                mutants.append((point, edit, patch, mutant_id))
+            subsumed = {i for i, (_, _, _, mutant_id) in enumerate(mutants)
+                        if config.dominator_analysis is not None and
+                        not config.dominator_analysis.should_run(func_key, func_hash, mutant_id)}
+            # Audit sample of the stable categories, drawn among the mutants that are not subsumed
+            audited = config.kill_stats.audit_sample(func_key, [(i, point[2]) for i, (point, *_) in enumerate(mutants)
+                                                                if i not in subsumed]) if config.selective else None
+            for i, (point, edit, patch, mutant_id) in enumerate(mutants):
                 mutant_base = f"mutant_{base_name}_{func_name}_{i}"
-                mutant_code = Mutator.apply_single_mutation(source_code, point)
-                mutant_path = os.path.join(mutants_dir, f"{mutant_base}.c")
-                with open(mutant_path, 'w') as mf:
-                    mf.write(mutant_code)
-
-                mutant_killed = False
-                killed_by = None
-                survived_by = []
-                for test_path in relevant_tests:
-                    test_base = os.path.splitext(os.path.basename(test_path))[0]
-                    binary_path = os.path.join(mutants_dir, f"{mutant_base}")
-                    logger.info(f"Building... [Mutant {mutant_base}]")
-                    build_ok = Builder.build_sources([mutant_path, test_path], binary_path)
-                    if not build_ok:
-                        logger.warning(f"[Pass] [Mutant {mutant_base} | Test {test_base}] Build failed. Counting as killed.")
-                        mutant_killed = True
-                        killed_by = test_path
-                        mutant_test_records.append((mutant_path, test_path, "killed", source_path))
-                        break
-                    else:
-                        logger.info(f"Build Success")
-
-                    logger.info(f"Testing...")
-                    result = Tester.run_tests(binary_path)
-                    if not result:
-                        logger.info(f"[Pass] [Mutant {mutant_base} | Test {test_base}] Killed.")
-                        mutant_killed = True
-                        killed_by = test_path
-                        mutant_test_records.append((mutant_path, test_path, "killed", source_path))
-                        break
-                    else:
-                        logger.error(f"[Fail] [Mutant {mutant_base} | Test {test_base}] Survived this test.")
-                        survived_by.append(test_path)
-                        mutant_test_records.append((mutant_path, test_path, "survived", source_path))
-                print(LONG_DASH)
-                
-                total += 1
-                if mutant_killed:
-                    killed += 1
+                line_idx, col, op = point
+                if i in subsumed:
+                    logger.info(f"Mutant {mutant_base} is subsumed in unchanged function '{func_name}'. Skipping.")
+                    config.skipped_subsumed += 1
+                    config.progress.skip()
+                    continue
+                if audited is not None and i not in audited:
+                    logger.info(f"Mutant {mutant_base}: '{op}' in '{func_name}' has a stable kill rate. Skipping (not audited).")
+                    config.skipped_selective += 1
+                    mean_executions = config.kill_stats.mean_executions(func_key, op)
+                    config.saved_executions += mean_executions if mean_executions is not None else len(relevant_tests)
+                    config.progress.skip()
+                    continue
+                config.mutant_index.add(mutant_base, patch)
+                logger.info(f"Mutant {mutant_base}: {source_path}:{line_idx + 1}:{col + 1} '{patch.old}' -> '{patch.new}'")
+                pp_point = preprocessed.map_point(source_lines, edit[:3]) if preprocessed else None
+                if pp_point is not None:
+                    mutant_code = Mutator.apply_single_mutation(preprocessed.code, pp_point + edit[3:], preprocessed.line_offsets)
+                    mutant_path = os.path.join(mutants_dir, f"{mutant_base}{PreprocessedSource.output_extension(source_path)}")
                 else:
-                    survived += 1
+                    if preprocessed:
+                        logger.debug(f"Mutation point {line_idx + 1}:{col + 1} not found in preprocessed output. Using original source.")
+                    mutant_code = Mutator.apply_single_mutation(source_code, edit, line_offsets)
+                    mutant_path = os.path.join(mutants_dir, f"{mutant_base}.c")
+                if config.write_mutant_sources:
+                    with span('write_mutant', source=source_path, function=func_name, mutant=mutant_base), \
+                         open(mutant_path, 'w', newline='') as mf:
+                        mf.write(mutant_code)
+
+                future = config.executor.submit(Mutator.run_mutant_job, mutant_base, mutant_path, mutant_code,
+                                                source_path, func_name, relevant_tests, config)
+                pending.append((future, mutant_base, mutant_id, point, patch, func_name, func_key, func_hash, relevant_tests))
+                # Keep a bounded window of mutants in flight; verdicts are handled in submission order.
+                while len(pending) > 2 * config.executor.workers:
+                    finish(*pending.popleft())
+        while pending:
+            finish(*pending.popleft())
 
         return total, killed, survived, mutant_test_records
@@ -1,35 +1,77 @@
 import re
 import os
+import fnmatch
+import hashlib
 import logging
-from typing import List, Tuple, Dict, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Set, Optional
+
+from test_index import TestIndex
+from constants import *
 
 logger = logging.getLogger(__name__)
 
+# Tokens of a single line, used to find the operands of a binary operator.
+TOKEN_PATTERN = re.compile(
+    r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[A-Za-z_0-9.]+|'
+    r'<<=|>>=|->|\+\+|--|<<|>>|<=|>=|==|!=|&&|\|\||[-+*/%&|^]=|\S'
+)
+# Binary operator precedence (lower binds tighter), as in C.
+BINARY_PRECEDENCE = {
+    '*': 3, '/': 3, '%': 3, '+': 4, '-': 4, '<<': 5, '>>': 5,
+    '<': 6, '<=': 6, '>': 6, '>=': 6, '==': 7, '!=': 7,
+    '&': 8, '^': 9, '|': 10, '&&': 11, '||': 12
+}
+# Tokens that always end an operand expression.
+EXPRESSION_BOUNDARIES = {'?', ':', ',', ';', '{', '}', '=', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<<=', '>>=',
+                         'return', 'case'}
+# Keywords that may directly precede a parenthesized condition.
+STATEMENT_KEYWORDS = {'if', 'while', 'for', 'switch', 'return', 'case', 'else', 'do'}
+# Line endings/beginnings that allow an operand to stop at a line break.
+CONTINUATION_CHARS = set('(){};,&|?:=')
+
 class Parser:
     @staticmethod
-    def collect_c_cpp_files(paths: str | List[str], recursive: bool = True) -> List[str]:
+    def collect_c_cpp_files(paths: str | List[str], recursive: bool = True, include: Optional[List[str]] = None,
+                            exclude: Optional[List[str]] = None, exclude_dirs: Optional[List[str]] = None,
+                            parallel: bool = False) -> List[str]:
         """
         Return a list of C/C++ source and header files from a file, directory path, or list of paths.
         Searches recursively by default.
         Supported extensions: .c, .cpp, .h, .hpp
+        :param include: Glob patterns; when given, only files matching one of them are collected.
+        :param exclude: Glob patterns for files and folders to skip. Patterns from a .utmuterignore file
+                        in a searched folder are added. The default build/output folder names
+                        (DEFAULT_EXCLUDE_PATTERNS) only skip folders.
+        :param exclude_dirs: Folders that are never searched (e.g. the mutants output folder).
+        :param parallel: Scan the folders of each tree level in parallel threads.
+        Patterns are matched against both the name and the path relative to the searched folder. Inside
+        the searched folder that is the symlink-resolved path, so the result does not depend on which
+        symlink leads to a file. Symlinked files and folders are collected/searched only once.
         """
         if isinstance(paths, str):
             paths = [paths]  # Convert single path to a list for uniform handling
 
         collected_files: List[str] = []
+        seen_files: Set[str] = set()
         supported_extensions: Set[str] = {'.c', '.cpp', '.h', '.hpp'}
+        excluded_real_dirs: Set[str] = {os.path.realpath(d) for d in (exclude_dirs or [])}
+
+        def add_file(file_path: str):
+            real_path = os.path.realpath(file_path)
+            if real_path not in seen_files:
+                seen_files.add(real_path)
+                collected_files.append(os.path.abspath(file_path))
 
         for path in paths:
             if os.path.isfile(path):
                 if os.path.splitext(path)[1] in supported_extensions:
-                    collected_files.append(os.path.abspath(path))
+                    add_file(path)
             elif os.path.isdir(path):
-                for root, _, files in os.walk(path):
-                    for fname in files:
-                        if os.path.splitext(fname)[1] in supported_extensions:
-                            collected_files.append(os.path.abspath(os.path.join(root, fname)))
-                    if not recursive:
-                        break
+                patterns = (exclude or []) + Parser.read_ignore_file(path)
+                for file_path in Parser._scan_tree(path, recursive, supported_extensions, include, patterns,
+                                                   list(DEFAULT_EXCLUDE_PATTERNS), excluded_real_dirs, parallel):
+                    add_file(file_path)
             else:
                 logger.warning(f"Path not found or is not a file/directory: {path}")
 
@@ -37,15 +79,93 @@ class Parser:
             logger.debug(f"No C/C++ files found in: {paths}")
         return collected_files
 
+    @staticmethod
+    def read_ignore_file(folder: str) -> List[str]:
+        """Read glob patterns (one per line, '#' comments) from the folder's .utmuterignore file."""
+        ignore_path = os.path.join(folder, IGNORE_FILE)
+        if not os.path.isfile(ignore_path):
+            return []
+        with open(ignore_path, 'r') as f:
+            return [line.strip().rstrip('/') for line in f if line.strip() and not line.strip().startswith('#')]
+
+    @staticmethod
+    def _matches(name: str, rel_path: str, patterns: List[str]) -> bool:
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(rel_path, p) for p in patterns)
+
+    @staticmethod
+    def _scan_tree(root: str, recursive: bool, extensions: Set[str], include: Optional[List[str]],
+                   exclude: List[str], exclude_dir_names: List[str], excluded_real_dirs: Set[str],
+                   parallel: bool) -> List[str]:
+        """
+        Walk a folder tree level by level with os.scandir, applying the include/exclude rules.
+        :param exclude_dir_names: Patterns that only skip folders (the default build/VCS folders).
+        """
+        files: List[str] = []
+        real_root = os.path.realpath(root)
+        visited_dirs: Set[str] = {real_root}
+
+        def canonical(entry: os.DirEntry, real_folder: str) -> Tuple[str, str]:
+            """Return the name and root-relative path of an entry, with symlinks inside the root resolved."""
+            real_path = os.path.realpath(entry.path) if entry.is_symlink() else os.path.join(real_folder, entry.name)
+            rel_path = os.path.relpath(real_path, real_root)
+            if rel_path == '..' or rel_path.startswith('..' + os.sep):
+                return entry.name, os.path.relpath(entry.path, root).replace(os.sep, '/')
+            return os.path.basename(real_path), rel_path.replace(os.sep, '/')
+
+        def scan(folder: str) -> Tuple[List[str], List[str]]:
+            sub_dirs: List[str] = []
+            found: List[str] = []
+            real_folder = os.path.realpath(folder)
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in sorted(entries, key=lambda e: e.name):
+                        name, rel_path = canonical(entry, real_folder)
+                        if Parser._matches(name, rel_path, exclude):
+                            continue
+                        if entry.is_dir():
+                            if not Parser._matches(name, rel_path, exclude_dir_names):
+                                sub_dirs.append(entry.path)
+                        elif entry.is_file() and os.path.splitext(entry.name)[1] in extensions:
+                            if include and not Parser._matches(name, rel_path, include):
+                                continue
+                            found.append(entry.path)
+            except OSError as e:
+                logger.warning(f"Cannot read folder {folder}: {e}")
+            return found, sub_dirs
+
+        level = [root]
+        executor = ThreadPoolExecutor() if parallel else None
+        try:
+            while level:
+                results = list(executor.map(scan, level)) if executor else [scan(folder) for folder in level]
+                next_level: List[str] = []
+                candidates: List[str] = []
+                for found, sub_dirs in results:
+                    files.extend(found)
+                    if recursive:
+                        candidates.extend(sub_dirs)
+                # A real folder is searched under its own path rather than a symlink's
+                for sub_dir in sorted(candidates, key=os.path.islink):
+                    real_dir = os.path.realpath(sub_dir)
+                    if real_dir in visited_dirs or real_dir in excluded_real_dirs:
+                        continue
+                    visited_dirs.add(real_dir)
+                    next_level.append(sub_dir)
+                level = next_level
+        finally:
+            if executor:
+                executor.shutdown()
+        return files
+
     @staticmethod
     def find_matching_tests(test_paths: List[str], source_base_name: str) -> List[str]:
-        """Find test files whose name contains the source base name."""
+        """
+        Find test files whose name contains the source base name as whole tokens.
+        Builds a throwaway TestIndex; use TestIndex directly when matching many sources.
+        """
         if not source_base_name:
             return []
-        return [
-            test_path for test_path in test_paths
-            if source_base_name in os.path.splitext(os.path.basename(test_path))[0]
-        ]
+        return TestIndex(test_paths).tests_for_source(source_base_name)
 
     @staticmethod
     def get_function_name(source_lines: List[str], line_idx: int) -> str:
@@ -54,6 +174,15 @@ class Parser:
         scanning upwards for a function definition. This is a best-effort
         approach using regex and may not cover all C/C++ syntax complexities.
         """
+        definition = Parser.get_function_definition(source_lines, line_idx)
+        if definition is not None:
+            return definition[1]
+        logger.debug(f"Could not determine function name for mutation point near line {line_idx + 1}. Defaulting to 'unknownfunc'.")
+        return "unknownfunc"
+
+    @staticmethod
+    def get_function_definition(source_lines: List[str], line_idx: int) -> Optional[Tuple[int, str]]:
+        """Return (line index, name) of the function definition enclosing a line, or None if not found."""
         # Regex attempts to match: type_and_modifiers function_name (params) {
         # It allows for pointers (*), references (&), and 'const' modifiers.
         pattern = re.compile(
@@ -75,9 +204,44 @@ class Parser:
                 func_name = m.group(1)
                 # Avoid matching 'if', 'for', 'while', 'switch' as function names
                 if func_name not in ['if', 'for', 'while', 'switch']:
-                    return func_name
-        logger.debug(f"Could not determine function name for mutation point near line {line_idx + 1}. Defaulting to 'unknownfunc'.")
-        return "unknownfunc"
+                    return i, func_name
+        return None
+
+    @staticmethod
+    def get_function_end(source_lines: List[str], start_idx: int) -> int:
+        """
+        Return the line index of the brace closing the function defined at start_idx.
+        Braces in line comments and string/char literals are ignored.
+        """
+        depth = 0
+        opened = False
+        for i in range(start_idx, len(source_lines)):
+            line = re.sub(r'"(\\.|[^"\\])*"', '', source_lines[i])
+            line = re.sub(r"'(\\.|[^'\\])*'", '', line)
+            line = re.sub(r'//.*', '', line)
+            for ch in line:
+                if ch == '{':
+                    depth += 1
+                    opened = True
+                elif ch == '}':
+                    depth -= 1
+                    if opened and depth == 0:
+                        return i
+        return len(source_lines) - 1
+
+    @staticmethod
+    def function_fingerprint(source_lines: List[str], line_idx: int) -> Tuple[int, str]:
+        """
+        Return (start line index, content hash) of the function enclosing a line. The hash only changes
+        when the function's own text changes, so it identifies unchanged functions across runs.
+        """
+        definition = Parser.get_function_definition(source_lines, line_idx)
+        if definition is None:
+            return 0, ''
+        start_idx = definition[0]
+        end_idx = Parser.get_function_end(source_lines, start_idx)
+        body = '\n'.join(source_lines[start_idx:end_idx + 1])
+        return start_idx, hashlib.sha1(body.encode()).hexdigest()[:16]
 
     @staticmethod
     def group_mutation_points_by_function(mutation_points: List[Tuple[int, int, str]], source_lines: List[str]) -> Dict[str, List[Tuple[int, int, str]]]:
@@ -89,6 +253,115 @@ class Parser:
             func_mut_points.setdefault(func_name, []).append(point)
         return func_mut_points
 
+    @staticmethod
+    def find_operand_span(source_lines: List[str], line_idx: int, col: int, op: str) -> Optional[Tuple[int, int]]:
+        """
+        Return the (start, end) columns of the expression 'lhs op rhs' around the binary operator at col,
+        using C precedence. The expression must lie on one line: if an operand runs into a line break that
+        does not end an expression there, or an operand is empty, None is returned.
+        """
+        line = source_lines[line_idx]
+        tokens = [(m.start(), m.group()) for m in TOKEN_PATTERN.finditer(line)]
+        op_index = next((i for i, (start, text) in enumerate(tokens) if start == col and text == op), None)
+        if op_index is None:
+            return None
+        precedence = BINARY_PRECEDENCE[op]
+
+        def is_primary(text: str) -> bool:
+            return (text[0].isalnum() or text[0] in '_."\'') and text not in EXPRESSION_BOUNDARIES
+
+        # Right operand: stop at an operator binding as loosely or looser (left associativity).
+        end = None
+        depth = 0
+        expect_operand = True
+        for start, text in tokens[op_index + 1:]:
+            if text in ('(', '['):
+                depth += 1
+                expect_operand = True
+                continue
+            if text in (')', ']'):
+                if depth == 0:
+                    end = start
+                    break
+                depth -= 1
+                expect_operand = False
+                continue
+            if depth == 0:
+                if text in EXPRESSION_BOUNDARIES:
+                    end = start
+                    break
+                if not expect_operand and text in BINARY_PRECEDENCE and BINARY_PRECEDENCE[text] >= precedence:
+                    end = start
+                    break
+                if not expect_operand and is_primary(text):
+                    # Two adjacent primaries (e.g. after a cast) cannot be split safely.
+                    return None
+            if is_primary(text):
+                expect_operand = False
+            elif text not in ('++', '--'):
+                expect_operand = True
+        if depth:
+            return None
+        if end is None:
+            next_line = next((l.strip() for l in source_lines[line_idx + 1:] if l.strip()), '')
+            if next_line and next_line[0] not in CONTINUATION_CHARS:
+                return None
+            end = len(line.rstrip())
+        end = col + len(op) + len(line[col + len(op):end].rstrip())
+        if end == col + len(op):
+            return None
+
+        # Left operand: stop at an operator binding looser, or at an unmatched opening bracket.
+        begin = None
+        depth = 0
+        previous_primary = False
+        after_group = False
+        for start, text in reversed(tokens[:op_index]):
+            if text in (')', ']'):
+                depth += 1
+                previous_primary = False
+                continue
+            if text in ('(', '['):
+                if depth == 0:
+                    begin = start + 1
+                    break
+                depth -= 1
+                previous_primary = True
+                after_group = depth == 0
+                continue
+            if depth == 0:
+                if text in EXPRESSION_BOUNDARIES or (text in BINARY_PRECEDENCE and BINARY_PRECEDENCE[text] > precedence):
+                    begin = start + len(text)
+                    break
+                # An identifier directly before a bracketed group is a call or subscript, unless it is a keyword.
+                calls_group = after_group and text not in STATEMENT_KEYWORDS
+                if is_primary(text) and previous_primary and not calls_group:
+                    begin = start + len(text)
+                    break
+            previous_primary = is_primary(text)
+            after_group = False
+        if depth:
+            return None
+        if begin is None:
+            previous_line = next((l.strip() for l in reversed(source_lines[:line_idx]) if l.strip()), '')
+            if previous_line and previous_line[-1] not in CONTINUATION_CHARS:
+                return None
+            begin = 0
+        begin += len(line[begin:col]) - len(line[begin:col].lstrip())
+        if begin >= col:
+            return None
+        return begin, end
+
+    @staticmethod
+    def line_offsets(source_code: str) -> List[int]:
+        """Return the character offset at which each line (as split by str.splitlines) starts."""
+        offsets: List[int] = []
+        position = 0
+        for line in source_code.splitlines(keepends=True):
+            offsets.append(position)
+            position += len(line)
+        return offsets
+
     @staticmethod
     def find_mutation_points(source_code: str) -> List[Tuple[int, int, str]]:
         """
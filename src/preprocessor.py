@@ -0,0 +1,84 @@
+# preprocessor.py
+"""
+Module for preprocess-once mutation: each source is run through the preprocessor a single time
+and mutants are produced directly in the preprocessed translation unit.
+"""
+
+import os
+import re
+import logging
+from typing import List, Tuple, Dict, Optional
+
+from builder import Builder
+from parser import Parser
+
+logger = logging.getLogger(__name__)
+
+# GCC line marker: # <line> "<file>" [flags]
+LINE_MARKER_PATTERN = re.compile(r'^#\s*(?:line\s+)?(\d+)\s+"((?:\\.|[^"\\])*)"')
+
+class PreprocessedSource:
+    """A preprocessed translation unit plus the mapping from original lines to preprocessed lines."""
+
+    def __init__(self, source_path: str, preprocessed_code: str):
+        self.source_path = source_path
+        self.code = preprocessed_code
+        self.lines = preprocessed_code.splitlines()
+        self.line_offsets = Parser.line_offsets(preprocessed_code)
+        self.line_map = PreprocessedSource.parse_line_markers(self.lines)
+
+    @staticmethod
+    def preprocess(source_path: str, output_path: str, compiler: str = "gcc", flags: Optional[List[str]] = None,
+                   cwd: Optional[str] = None) -> Optional["PreprocessedSource"]:
+        """Preprocess a source file once and load the result, or return None if preprocessing failed."""
+        if not Builder.preprocess_source(os.path.abspath(source_path), os.path.abspath(output_path), compiler, flags, cwd):
+            return None
+        with open(output_path, 'r', newline='') as f:
+            return PreprocessedSource(source_path, f.read())
+
+    @staticmethod
+    def parse_line_markers(pp_lines: List[str]) -> Dict[int, int]:
+        """
+        Map 0-based line indices of the main file to 0-based line indices in the preprocessed output.
+        The main file is the one named by the first line marker.
+        """
+        line_map: Dict[int, int] = {}
+        main_file = None
+        current_file = None
+        current_line = 0
+        for pp_idx, line in enumerate(pp_lines):
+            m = LINE_MARKER_PATTERN.match(line)
+            if m:
+                current_line = int(m.group(1))
+                current_file = m.group(2)
+                if main_file is None:
+                    main_file = current_file
+                continue
+            if current_file is not None and current_file == main_file:
+                line_map.setdefault(current_line - 1, pp_idx)
+            current_line += 1
+        return line_map
+
+    def map_point(self, source_lines: List[str], mutation_point: Tuple[int, int, str]) -> Optional[Tuple[int, int, str]]:
+        """
+        Translate a mutation point of the original source into the preprocessed output.
+        Leading indentation may differ; everything from the first token up to the operator must be
+        unchanged (no macro expansion or inline comment before it), otherwise None is returned.
+        """
+        idx, col, op = mutation_point
+        pp_idx = self.line_map.get(idx)
+        if pp_idx is None or idx >= len(source_lines):
+            return None
+        original_line = source_lines[idx]
+        pp_line = self.lines[pp_idx]
+        original_indent = len(original_line) - len(original_line.lstrip())
+        pp_indent = len(pp_line) - len(pp_line.lstrip())
+        end = col - original_indent + len(op)
+        if end <= 0 or original_line.lstrip()[:end] != pp_line.lstrip()[:end]:
+            return None
+        return (pp_idx, col - original_indent + pp_indent, op)
+
+    @staticmethod
+    def output_extension(source_path: str) -> str:
+        """Return the extension GCC recognises as already-preprocessed input for the source language."""
+        return '.i' if os.path.splitext(source_path)[1] == '.c' else '.ii'
@@ -0,0 +1,140 @@
+# process_usage.py
+"""
+Module for running compiler and test processes with per-process resource accounting.
+
+run_process reaps each child with os.wait4, which returns the resource usage of that process
+alone (plus the descendants it waited for, e.g. the test binary started by a shell), so usage
+can be attributed per build and test even when several run in parallel. Callers collect the
+usages of the processes started inside a block with collect_usage(); collectors are
+thread-local and may be nested. run_process_until streams the output of a process line by line
+and kills it on the first line matching a pattern, e.g. a test's first failure message.
+"""
+
+import os
+import time
+import signal
+import threading
+import subprocess
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Tuple
+
+class ProcessUsage(NamedTuple):
+    wall_s: float
+    user_s: float
+    sys_s: float
+    max_rss_kb: int
+    in_blocks: int
+    out_blocks: int
+
+    @property
+    def cpu_s(self) -> float:
+        return self.user_s + self.sys_s
+
+_local = threading.local()
+
+@contextmanager
+def collect_usage() -> Iterator[List[ProcessUsage]]:
+    """Collect the usage of every process run by this thread inside the block."""
+    stack = getattr(_local, 'collectors', None)
+    if stack is None:
+        stack = _local.collectors = []
+    usages: List[ProcessUsage] = []
+    stack.append(usages)
+    try:
+        yield usages
+    finally:
+        stack.pop()
+
+def _read(stream, chunks: List[bytes]):
+    chunks.append(stream.read())
+    stream.close()
+
+class _AbortOnMatch:
+    """Kills a process group on the first output line that matches a pattern."""
+
+    def __init__(self, pattern: Pattern, pid: int):
+        self.pattern = pattern
+        self.pid = pid
+        self.line: Optional[str] = None
+        self.exited = False
+        self._lock = threading.Lock()
+
+    def scan(self, line: bytes):
+        if self.line is not None:
+            return
+        text = line.decode(errors='replace').rstrip('\r\n')
+        if not self.pattern.search(text):
+            return
+        with self._lock:
+            if self.line is not None:
+                return
+            self.line = text
+            # The process is not reaped before exited is set, so its group ID cannot be reused yet.
+            if not self.exited:
+                try:
+                    os.killpg(self.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def process_exited(self):
+        with self._lock:
+            self.exited = True
+
+def _read_lines(stream, chunks: List[bytes], abort: _AbortOnMatch):
+    for line in iter(stream.readline, b''):
+        chunks.append(line)
+        abort.scan(line)
+    stream.close()
+
+def run_process(command, input: Optional[bytes] = None, cwd: Optional[str] = None, shell: bool = False,
+                env: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, bytes, ProcessUsage]:
+    """
+    Run a command to completion, capturing stdout and stderr.
+    :return: The exit code (negative signal number if killed), stdout, stderr and the resource usage.
+    """
+    return _run(command, input, cwd, shell, env)[:4]
+
+def run_process_until(command, abort_pattern: Pattern, cwd: Optional[str] = None, shell: bool = False,
+                      env: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, bytes, ProcessUsage, Optional[str]]:
+    """
+    Run a command, reading stdout and stderr line by line, and kill it (with all processes of its
+    session, e.g. the binary started by a shell) on the first line that matches abort_pattern.
+    :return: The exit code, stdout, stderr and the resource usage as run_process, plus the matching line or None.
+    """
+    return _run(command, None, cwd, shell, env, abort_pattern)
+
+def _run(command, input: Optional[bytes], cwd: Optional[str], shell: bool, env: Optional[Dict[str, str]],
+         abort_pattern: Optional[Pattern] = None) -> Tuple[int, bytes, bytes, ProcessUsage, Optional[str]]:
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd, shell=shell, env=env,
+                               start_new_session=abort_pattern is not None)
+    stdout: List[bytes] = []
+    stderr: List[bytes] = []
+    abort = _AbortOnMatch(abort_pattern, process.pid) if abort_pattern is not None else None
+    if abort is None:
+        readers = [threading.Thread(target=_read, args=(process.stdout, stdout)),
+                   threading.Thread(target=_read, args=(process.stderr, stderr))]
+    else:
+        readers = [threading.Thread(target=_read_lines, args=(process.stdout, stdout, abort)),
+                   threading.Thread(target=_read_lines, args=(process.stderr, stderr, abort))]
+    for reader in readers:
+        reader.start()
+    if input is not None:
+        try:
+            process.stdin.write(input)
+        except BrokenPipeError:
+            pass
+        process.stdin.close()
+    if abort is not None:
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        abort.process_exited()
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    for reader in readers:
+        reader.join()
+    usage = ProcessUsage(time.perf_counter() - start, rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss,
+                         rusage.ru_inblock, rusage.ru_oublock)
+    for usages in getattr(_local, 'collectors', ()):
+        usages.append(usage)
+    return process.returncode, b''.join(stdout), b''.join(stderr), usage, abort.line if abort else None
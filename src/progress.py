@@ -0,0 +1,186 @@
+# progress.py
+"""
+Module for live progress, throughput and ETA of a run.
+
+The tracker is a verdict listener: every finished mutant updates the counters. Sources report
+their planned mutants when they are expanded and skipped mutants when they are dropped, so the
+total grows source by source. Build and test phases are timed separately. The ETA uses an
+exponential moving average of the time per mutant, so it follows recent throughput rather than
+the start-up phase. Updates only take a lock and add numbers; the status line and the JSON
+status file are refreshed at most every STATUS_LINE_INTERVAL / status_interval seconds. While the
+status line is shown, the log handlers writing to stderr are wrapped so that each log record
+clears the line first and redraws it afterwards; console output of the run goes through
+print_line() for the same reason.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from mutant_store import MutantVerdict
+from artifact_cache import write_atomic
+from constants import *
+
+class _LineAwareHandler(logging.Handler):
+    """Wraps a stderr log handler: clears the status line before a record and redraws it after."""
+
+    def __init__(self, handler: logging.Handler, tracker: "ProgressTracker"):
+        super().__init__(handler.level)
+        self.handler = handler
+        self.tracker = tracker
+
+    def emit(self, record: logging.LogRecord):
+        with self.tracker.line_cleared():
+            self.handler.handle(record)
+
+class ProgressTracker:
+    def __init__(self, show_line: bool = True, status_path: Optional[str] = None,
+                 status_interval: float = DEFAULT_STATUS_INTERVAL):
+        """
+        :param show_line: Draw a refreshing status line on stderr (only when stderr is a terminal).
+        :param status_path: Periodically write the status as JSON to this file.
+        """
+        self.show_line = show_line and sys.stderr.isatty()
+        self.status_path = status_path
+        self.status_interval = status_interval
+        self.planned = 0
+        self.done = 0
+        self.killed = 0
+        self.phase_seconds: Dict[str, float] = {'build': 0.0, 'test': 0.0}
+        self.in_flight: Dict[str, int] = {'build': 0, 'test': 0}
+        # Called with (phase, seconds) after every timed phase, e.g. by the metrics histograms.
+        self.phase_observer: Optional[Callable[[str, float], None]] = None
+        self.start = time.perf_counter()
+        self.seconds_per_mutant: Optional[float] = None
+        self._last_done_time = self.start
+        self._last_line = 0.0
+        self._last_status = 0.0
+        self._lock = threading.Lock()
+        self._draw_lock = threading.RLock()
+        self._line_shown = False
+        if self.show_line:
+            self._wrap_log_handlers()
+
+    def _wrap_log_handlers(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stderr:
+                root.removeHandler(handler)
+                root.addHandler(_LineAwareHandler(handler, self))
+
+    def _unwrap_log_handlers(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, _LineAwareHandler) and handler.tracker is self:
+                root.removeHandler(handler)
+                root.addHandler(handler.handler)
+
+    def plan(self, count: int):
+        with self._lock:
+            self.planned += count
+
+    def skip(self, count: int = 1):
+        """Remove planned mutants that will not run (subsumed, not audited)."""
+        with self._lock:
+            self.planned -= count
+
+    @contextmanager
+    def timed(self, phase: str):
+        with self._lock:
+            self.in_flight[phase] = self.in_flight.get(phase, 0) + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + elapsed
+                self.in_flight[phase] -= 1
+            if self.phase_observer is not None:
+                self.phase_observer(phase, elapsed)
+
+    def __call__(self, verdict: MutantVerdict):
+        now = time.perf_counter()
+        with self._lock:
+            self.done += 1
+            self.killed += verdict.killed
+            duration = now - self._last_done_time
+            self._last_done_time = now
+            self.seconds_per_mutant = duration if self.seconds_per_mutant is None else \
+                ETA_SMOOTHING * duration + (1 - ETA_SMOOTHING) * self.seconds_per_mutant
+        if self.show_line and now - self._last_line >= STATUS_LINE_INTERVAL:
+            self._last_line = now
+            self._draw_line()
+        if self.status_path and now - self._last_status >= self.status_interval:
+            self._last_status = now
+            self.write_status()
+
+    def status(self) -> dict:
+        with self._lock:
+            elapsed = time.perf_counter() - self.start
+            remaining = max(self.planned - self.done, 0)
+            return {
+                'done': self.done,
+                'planned': self.planned,
+                'killed': self.killed,
+                'kill_rate': self.killed / self.done if self.done else None,
+                'elapsed_s': round(elapsed, 3),
+                'mutants_per_s': round(self.done / elapsed, 3) if elapsed > 0 else None,
+                'build_s': round(self.phase_seconds['build'], 3),
+                'test_s': round(self.phase_seconds['test'], 3),
+                'eta_s': round(remaining * self.seconds_per_mutant, 1) if self.seconds_per_mutant is not None else None
+            }
+
+    def status_line(self) -> str:
+        s = self.status()
+        busy = s['build_s'] + s['test_s']
+        build_share = f"{s['build_s'] / busy:.0%}" if busy else "-"
+        kill_rate = f"{s['kill_rate']:.0%}" if s['kill_rate'] is not None else "-"
+        eta = time.strftime('%H:%M:%S', time.gmtime(s['eta_s'])) if s['eta_s'] is not None else "--:--:--"
+        return (f"[{s['done']}/{s['planned']}] {s['mutants_per_s'] or 0:.2f} mutants/s | "
+                f"build {build_share} of busy time | killed {kill_rate} | ETA {eta}")
+
+    @contextmanager
+    def line_cleared(self):
+        """Clear the status line for the duration of the block and redraw it afterwards."""
+        with self._draw_lock:
+            if self._line_shown:
+                sys.stderr.write('\r\033[K')
+                sys.stderr.flush()
+            try:
+                yield
+            finally:
+                if self._line_shown:
+                    self._draw_line()
+
+    def print_line(self, text: str = ''):
+        """Print a line to stdout without gluing it onto the status line."""
+        with self.line_cleared():
+            print(text)
+            sys.stdout.flush()
+
+    def _draw_line(self):
+        with self._draw_lock:
+            sys.stderr.write('\r\033[K' + self.status_line())
+            sys.stderr.flush()
+            self._line_shown = True
+
+    def write_status(self):
+        write_atomic(os.path.abspath(self.status_path), json.dumps(self.status()).encode())
+
+    def close(self):
+        """Write the final status and leave the terminal on a fresh line."""
+        if self.status_path:
+            self.write_status()
+        if self.show_line:
+            with self._draw_lock:
+                self._draw_line()
+                sys.stderr.write('\n')
+                sys.stderr.flush()
+                self._line_shown = False
+            self._unwrap_log_handlers()
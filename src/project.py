@@ -0,0 +1,207 @@
+# project.py
+"""
+Module for describing multi-translation-unit C/C++ projects.
+
+A project is loaded either from a ``compile_commands.json`` compilation database or
+from a simple JSON project file, and provides per-file compiler flags plus the set of
+translation units that must be linked into every test binary. Test sources and other units that
+define ``main`` (compilation databases usually list them too) are never linked next to a mutant.
+"""
+
+import os
+import re
+import json
+import shlex
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Optional, Set, Tuple
+
+from builder import Builder
+
+logger = logging.getLogger(__name__)
+
+# Dependency file generation; the flags with an operand also come joined ('-MFdeps.d')
+DEPENDENCY_FLAGS = {'-M', '-MM', '-MD', '-MMD', '-MG', '-MP'}
+DEPENDENCY_FLAGS_WITH_OPERAND = ('-MF', '-MT', '-MQ')
+MAIN_DEFINITION_PATTERN = re.compile(r'^\s*(?:int|void)\s+main\s*\(', re.MULTILINE)
+
+class Project:
+    """Per-file compile settings and link set of a C/C++ project."""
+
+    def __init__(self, compiler: str = "gcc", default_flags: Optional[List[str]] = None,
+                 file_flags: Optional[Dict[str, List[str]]] = None, file_dirs: Optional[Dict[str, str]] = None,
+                 link_set: Optional[List[str]] = None, link_flags: Optional[List[str]] = None,
+                 directory: Optional[str] = None):
+        self.compiler = compiler
+        self.default_flags = default_flags or []
+        self.file_flags = file_flags or {}
+        self.file_dirs = file_dirs or {}
+        self.link_set = link_set if link_set is not None else list(self.file_flags)
+        self.link_flags = link_flags or []
+        self.directory = directory or os.getcwd()
+        self.test_units: Set[str] = set()
+        self._defines_main: Dict[str, bool] = {}
+
+    @staticmethod
+    def load(path: str) -> "Project":
+        """
+        Load a project from a compile_commands.json database (a JSON list) or a
+        project file (a JSON object). Relative paths are resolved against the file's folder.
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        base_dir = os.path.dirname(os.path.abspath(path))
+        if isinstance(data, list):
+            return Project._from_compile_commands(data, base_dir)
+        return Project._from_project_file(data, base_dir)
+
+    @staticmethod
+    def _from_compile_commands(entries: List[dict], base_dir: str) -> "Project":
+        """Build a project from compilation database entries; every entry is part of the link set."""
+        compiler = "gcc"
+        file_flags: Dict[str, List[str]] = {}
+        file_dirs: Dict[str, str] = {}
+        for entry in entries:
+            directory = os.path.join(base_dir, entry.get('directory', '.'))
+            file_path = os.path.abspath(os.path.join(directory, entry['file']))
+            arguments = entry.get('arguments') or shlex.split(entry.get('command', ''))
+            if not arguments:
+                continue
+            compiler = arguments[0]
+            file_flags[file_path] = Project._strip_compile_arguments(arguments[1:], entry['file'], file_path)
+            file_dirs[file_path] = directory
+        logger.info(f"Loaded {len(file_flags)} translation unit(s) from compilation database.")
+        return Project(compiler=compiler, file_flags=file_flags, file_dirs=file_dirs, directory=base_dir)
+
+    @staticmethod
+    def _from_project_file(data: dict, base_dir: str) -> "Project":
+        """
+        Build a project from a project file of the form:
+        {"compiler": "gcc", "flags": [...], "files": {"<path>": [...]}, "link": ["<path>", ...], "link_flags": [...]}
+        """
+        directory = os.path.abspath(os.path.join(base_dir, data.get('directory', '.')))
+        resolve = lambda p: os.path.abspath(os.path.join(directory, p))
+        file_flags = {resolve(p): list(flags or []) for p, flags in data.get('files', {}).items()}
+        link_set = [resolve(p) for p in data['link']] if 'link' in data else None
+        logger.info(f"Loaded project file with {len(file_flags)} translation unit(s).")
+        return Project(
+            compiler=data.get('compiler', 'gcc'),
+            default_flags=list(data.get('flags', [])),
+            file_flags=file_flags,
+            file_dirs={p: directory for p in file_flags},
+            link_set=link_set,
+            link_flags=list(data.get('link_flags', [])),
+            directory=directory
+        )
+
+    @staticmethod
+    def _strip_compile_arguments(arguments: List[str], file_arg: str, file_path: str) -> List[str]:
+        """
+        Remove the input file, '-c', '-o <output>' and the dependency file flags from a compiler argument
+        list, so that cached-object and mutant compiles never write into the project's build tree.
+        """
+        flags: List[str] = []
+        skip_next = False
+        for arg in arguments:
+            if skip_next:
+                skip_next = False
+                continue
+            if arg == '-o' or arg in DEPENDENCY_FLAGS_WITH_OPERAND:
+                skip_next = True
+                continue
+            if arg == '-c' or arg.startswith('-o') or arg in (file_arg, file_path):
+                continue
+            if arg in DEPENDENCY_FLAGS or arg.startswith(DEPENDENCY_FLAGS_WITH_OPERAND):
+                continue
+            flags.append(arg)
+        return flags
+
+    def flags_for(self, path: str) -> List[str]:
+        """Return the compiler flags for a file, falling back to the project defaults."""
+        return self.default_flags + self.file_flags.get(os.path.abspath(path), [])
+
+    def directory_for(self, path: str) -> str:
+        """Return the working directory the file is compiled in."""
+        return self.file_dirs.get(os.path.abspath(path), self.directory)
+
+    def exclude_tests(self, test_paths: List[str]):
+        """Keep all collected test sources out of the link set, not only the test being run."""
+        self.test_units = {os.path.abspath(p) for p in test_paths}
+
+    def defines_main(self, path: str) -> bool:
+        """Return whether a translation unit defines main(), read once per file."""
+        if path not in self._defines_main:
+            try:
+                with open(path, 'r', errors='replace') as f:
+                    self._defines_main[path] = MAIN_DEFINITION_PATTERN.search(f.read()) is not None
+            except OSError:
+                self._defines_main[path] = False
+            if self._defines_main[path]:
+                logger.debug(f"{path} defines main(); leaving it out of the link set.")
+        return self._defines_main[path]
+
+    def link_units_for(self, mutated_path: str, test_path: str) -> List[str]:
+        """Return the unmodified translation units linked next to a mutant and a test."""
+        excluded = {os.path.abspath(mutated_path), os.path.abspath(test_path)} | self.test_units
+        return [p for p in self.link_set if p not in excluded and not self.defines_main(p)]
+
+
+class ObjectCache:
+    """Compiles unmodified translation units once per run and hands out the cached objects."""
+
+    def __init__(self, project: Project, cache_dir: str):
+        self.project = project
+        self.cache_dir = os.path.abspath(cache_dir)
+        # Keyed by (source path, path the flags are taken from): a test compiled with the flags of one
+        # source is a different object than the same test compiled with the flags of another.
+        self.objects: Dict[Tuple[str, str], Optional[str]] = {}
+        # Parallel mutant workers must not compile the same object twice at once; other objects are not blocked.
+        self._lock = threading.Lock()
+        self._object_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def object_for(self, source_path: str, flags_from: Optional[str] = None) -> Optional[str]:
+        """
+        Return the cached object for a source file, compiling it on first use.
+        :param flags_from: Take the compile flags from this file instead (e.g. for test files
+                           that are not part of the project).
+        :return: The object path, or None if compilation failed.
+        """
+        source_path = os.path.abspath(source_path)
+        flags_path = os.path.abspath(flags_from) if flags_from and source_path not in self.project.file_flags else source_path
+        object_key = (source_path, flags_path)
+        with self._lock:
+            if object_key in self.objects:
+                return self.objects[object_key]
+            object_lock = self._object_locks.setdefault(object_key, threading.Lock())
+        with object_lock:
+            if object_key in self.objects:
+                return self.objects[object_key]
+            flags = self.project.flags_for(flags_path)
+            directory = self.project.directory_for(flags_path)
+            key = hashlib.sha1('\0'.join([source_path, self.project.compiler, directory] + flags).encode()).hexdigest()[:12]
+            base_name = os.path.splitext(os.path.basename(source_path))[0]
+            object_path = os.path.join(self.cache_dir, f"{base_name}_{key}.o")
+            logger.info(f"Compiling cached object for {source_path}")
+            ok = Builder.compile_object(source_path, object_path, self.project.compiler, flags, cwd=directory)
+            with self._lock:
+                self.objects[object_key] = object_path if ok else None
+            return object_path if ok else None
+
+    def invalidate(self, source_path: str):
+        """Forget the cached objects of a source that changed, so they are recompiled on next use."""
+        source_path = os.path.abspath(source_path)
+        with self._lock:
+            for object_key in [k for k in self.objects if k[0] == source_path]:
+                del self.objects[object_key]
+
+    def objects_for(self, source_paths: List[str]) -> Optional[List[str]]:
+        """Return cached objects for all given sources, or None if any of them fails to compile."""
+        objects = []
+        for path in source_paths:
+            obj = self.object_for(path)
+            if obj is None:
+                return None
+            objects.append(obj)
+        return objects
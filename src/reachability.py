@@ -0,0 +1,95 @@
+# reachability.py
+"""
+Module for finding functions that no test binary links in.
+
+Each test is linked against the original source compiled with -ffunction-sections, using
+--gc-sections and a linker map. Functions whose section is discarded from every test link
+cannot be reached by any test, so their mutants would always survive.
+"""
+
+import os
+import logging
+from typing import List, Set, Optional
+
+from builder import Builder
+from symbol_index import defined_functions
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+GC_LINK_FLAGS = ['-Wl,--gc-sections']
+
+def discarded_sections(map_path: str, object_path: str) -> Set[str]:
+    """Return the names of the input sections of an object listed as discarded in a GNU ld map file."""
+    discarded: Set[str] = set()
+    in_discarded = False
+    pending_section: Optional[str] = None
+    with open(map_path, 'r') as f:
+        for line in f:
+            if line.startswith('Discarded input sections'):
+                in_discarded = True
+                continue
+            if in_discarded and (line.startswith('Memory Configuration') or line.startswith('Linker script')):
+                break
+            if not in_discarded:
+                continue
+            parts = line.split()
+            if not parts:
+                continue
+            if line.startswith(' .'):
+                # Long section names put address, size and file on the following line.
+                pending_section = parts[0]
+                if len(parts) < 4:
+                    continue
+                file_name = parts[-1]
+            elif pending_section is not None and line.startswith('    '):
+                file_name = parts[-1]
+            else:
+                continue
+            if os.path.abspath(file_name) == object_path:
+                discarded.add(pending_section)
+            pending_section = None
+    return discarded
+
+class Reachability:
+    @staticmethod
+    def unreachable_functions(source_path: str, test_paths: List[str], work_dir: str, config=None) -> Set[str]:
+        """
+        Return the names of the source's functions that are discarded from every test link.
+        Returns an empty set (nothing pruned) if any of the pre-pass builds fails.
+        """
+        os.makedirs(work_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(source_path))[0]
+        object_path = os.path.abspath(os.path.join(work_dir, f"{base_name}_sections.o"))
+        project = config.project if config is not None else None
+        compiler = project.compiler if project else "gcc"
+        flags = (project.flags_for(source_path) if project else []) + ['-ffunction-sections']
+        if not Builder.compile_object(os.path.abspath(source_path), object_path, compiler, flags,
+                                      cwd=project.directory_for(source_path) if project else None):
+            return set()
+        functions = defined_functions(object_path)
+        discarded_everywhere = {f".text.{symbol}" for symbol in functions}
+
+        for test_path in test_paths:
+            test_base = os.path.splitext(os.path.basename(test_path))[0]
+            binary_path = os.path.join(work_dir, f"{base_name}_{test_base}_gc")
+            map_path = f"{binary_path}.map"
+            link_flags = GC_LINK_FLAGS + [f'-Wl,-Map={map_path}']
+            if project is not None:
+                test_object = config.object_cache.object_for(test_path, flags_from=source_path)
+                link_objects = config.object_cache.objects_for(project.link_units_for(source_path, test_path))
+                if test_object is None or link_objects is None:
+                    return set()
+                ok = Builder.link_objects([object_path, test_object] + link_objects, binary_path,
+                                          compiler, project.link_flags + link_flags)
+            else:
+                ok = Builder.build_sources([object_path, test_path], binary_path, flags=link_flags)
+            if not ok:
+                logger.warning(f"Reachability link of {test_path} failed; not pruning functions of {source_path}.")
+                return set()
+            discarded_everywhere &= discarded_sections(map_path, object_path)
+            for path in (binary_path, map_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        return {functions[section[len('.text.'):]] for section in discarded_everywhere}
@@ -0,0 +1,111 @@
+# record_store.py
+"""
+Module for the compact in-memory store of (mutant, test, result, source) records.
+
+Records are kept column-wise: the mutant, test and source paths as 32-bit IDs into a shared
+path table, the result as a one-byte verdict code, and the resource usage of the record's build
+and test processes as 32-bit floats/ints. Each path string is stored once, however many records
+refer to it, so a record costs 29 bytes of array payload (3 x 4-byte path IDs, one verdict byte,
+4 x 4-byte usage fields) instead of a 4-tuple of about 72 bytes plus its string references.
+Paths are interned once per mutant and test and amortized over their records
+(see benchmarks/bench_records.py).
+Iteration yields the same (mutant file, test file, result, source file) tuples as a list of records.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from process_usage import ProcessUsage
+
+VERDICTS = ('killed', 'survived')
+VERDICT_CODES = {verdict: code for code, verdict in enumerate(VERDICTS)}
+
+class RecordUsage(NamedTuple):
+    """Resources used by the processes of one record: its build (compile/link) and its test run."""
+    build_cpu_s: float = 0.0
+    test_cpu_s: float = 0.0
+    test_wall_s: float = 0.0
+    max_rss_kb: int = 0
+
+    @staticmethod
+    def of(build: List[ProcessUsage], test: List[ProcessUsage]) -> "RecordUsage":
+        return RecordUsage(sum(u.cpu_s for u in build), sum(u.cpu_s for u in test), sum(u.wall_s for u in test),
+                           max((u.max_rss_kb for u in build + test), default=0))
+
+NO_USAGE = RecordUsage()
+
+class PathTable:
+    """Interns path strings to small integer IDs."""
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id_for(self, path: str) -> int:
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = self._ids[path] = len(self.paths)
+            self.paths.append(path)
+        return path_id
+
+class RecordStore:
+    def __init__(self, paths: Optional[PathTable] = None):
+        """:param paths: Path table shared with other stores, so that extend() can copy IDs directly."""
+        self.paths = paths if paths is not None else PathTable()
+        self.mutants = array('I')
+        self.tests = array('I')
+        self.sources = array('I')
+        self.verdicts = array('B')
+        self.build_cpu = array('f')
+        self.test_cpu = array('f')
+        self.test_wall = array('f')
+        self.max_rss = array('I')
+
+    def append(self, record: Tuple[str, str, str, str], usage: RecordUsage = NO_USAGE):
+        mutant_path, test_path, result, source_path = record
+        self.mutants.append(self.paths.id_for(mutant_path))
+        self.tests.append(self.paths.id_for(test_path))
+        self.sources.append(self.paths.id_for(source_path))
+        self.verdicts.append(VERDICT_CODES[result])
+        self.build_cpu.append(usage.build_cpu_s)
+        self.test_cpu.append(usage.test_cpu_s)
+        self.test_wall.append(usage.test_wall_s)
+        self.max_rss.append(usage.max_rss_kb)
+
+    def extend(self, records: Iterable[Tuple[str, str, str, str]]):
+        if isinstance(records, RecordStore) and records.paths is self.paths:
+            self.mutants.extend(records.mutants)
+            self.tests.extend(records.tests)
+            self.sources.extend(records.sources)
+            self.verdicts.extend(records.verdicts)
+            self.build_cpu.extend(records.build_cpu)
+            self.test_cpu.extend(records.test_cpu)
+            self.test_wall.extend(records.test_wall)
+            self.max_rss.extend(records.max_rss)
+            return
+        if isinstance(records, RecordStore):
+            for record, usage in records.with_usage():
+                self.append(record, usage)
+            return
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.verdicts)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str, str]]:
+        paths = self.paths.paths
+        for mutant_id, test_id, verdict, source_id in zip(self.mutants, self.tests, self.verdicts, self.sources):
+            yield paths[mutant_id], paths[test_id], VERDICTS[verdict], paths[source_id]
+
+    def with_usage(self) -> Iterator[Tuple[Tuple[str, str, str, str], RecordUsage]]:
+        """Iterate the records together with their resource usage."""
+        usages = zip(self.build_cpu, self.test_cpu, self.test_wall, self.max_rss)
+        for record, usage in zip(self, usages):
+            yield record, RecordUsage(*usage)
+
+    def memory_bytes(self) -> int:
+        """Approximate payload of the columns (excluding the shared path strings)."""
+        columns = (self.mutants, self.tests, self.sources, self.verdicts,
+                   self.build_cpu, self.test_cpu, self.test_wall, self.max_rss)
+        return sum(column.itemsize * len(column) for column in columns)
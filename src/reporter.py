@@ -4,15 +4,44 @@ Module for reporting mutation testing results.
 """
 
 import os
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
 class Reporter:
     @staticmethod
-    def report_results(total: int, killed: int, survived: int, mutant_test_records: Optional[List[Tuple[str, str, str, str]]] = None):
-        """Prints a summary table of mutation testing results, including mutant/test details if provided."""
+    def report_results(total: int, killed: int, survived: int, mutant_test_records: Optional[Iterable[Tuple[str, str, str, str]]] = None,
+                       unreachable: Optional[List[Tuple[str, str, int]]] = None, kill_matrix=None,
+                       minimal_tests: Optional[List[str]] = None, dominator_counts: Optional[Dict[str, int]] = None,
+                       skipped_subsumed: int = 0, operator_families: Optional[Dict[str, List[int]]] = None,
+                       selective: Optional[Tuple[int, int, int]] = None,
+                       cache_stats: Optional[Dict[str, List[int]]] = None,
+                       function_counts: Optional[Dict[Tuple[str, str], List[int]]] = None,
+                       resources: Optional[Tuple[object, float, float]] = None,
+                       killing_cases: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Prints a summary table of mutation testing results, plus a per-function breakdown and the
+        mutant/test details if provided. The per-mutant results are streamed to the JSON Lines file.
+        """
         Reporter._print_summary(total, killed, survived)
+        if operator_families:
+            Reporter._print_operator_families(operator_families)
+        if function_counts:
+            Reporter._print_function_breakdown(function_counts)
         if mutant_test_records:
             Reporter._print_detailed_results(mutant_test_records)
+        if killing_cases:
+            Reporter._print_killing_cases(killing_cases)
+        if resources is not None:
+            Reporter._print_resources(*resources)
+        if unreachable:
+            Reporter._print_unreachable(unreachable)
+        if kill_matrix is not None:
+            Reporter._print_kill_matrix(kill_matrix, minimal_tests or [])
+        if dominator_counts or skipped_subsumed:
+            Reporter._print_dominators(dominator_counts, skipped_subsumed)
+        if selective is not None:
+            Reporter._print_selective(*selective)
+        if cache_stats:
+            Reporter._print_cache(cache_stats)
 
     @staticmethod
     def _print_summary(total: int, killed: int, survived: int):
@@ -33,7 +62,29 @@ class Reporter:
         print("+----------------+---------+")
 
     @staticmethod
-    def _print_detailed_results(mutant_test_records: List[Tuple[str, str, str, str]]):
+    def _print_operator_families(operator_families: Dict[str, List[int]]):
+        """Prints the mutants and kills per operator family (arithmetic, relational, logical)."""
+        print("\nMutants per Operator Family:")
+        print("+----------------+---------+---------+---------+")
+        print("| Family         | Mutants | Killed  | Score   |")
+        print("+----------------+---------+---------+---------+")
+        for family, (total, killed) in sorted(operator_families.items()):
+            print(f"| {family:<14} | {total:<7} | {killed:<7} | {killed / total * 100:6.1f}% |")
+        print("+----------------+---------+---------+---------+")
+
+    @staticmethod
+    def _print_function_breakdown(function_counts: Dict[Tuple[str, str], List[int]]):
+        """Prints the mutants, survivors and score of each function."""
+        print("\nMutants per Function:")
+        print("+-------------------------+----------------------------------------+---------+----------+---------+")
+        print("| Source File             | Function                               | Mutants | Survived | Score   |")
+        print("+-------------------------+----------------------------------------+---------+----------+---------+")
+        for (source_file, func_name), (total, killed) in function_counts.items():
+            print(f"| {os.path.basename(source_file):<23} | {func_name:<38} | {total:<7} | {total - killed:<8} | {killed / total * 100:6.1f}% |")
+        print("+-------------------------+----------------------------------------+---------+----------+---------+")
+
+    @staticmethod
+    def _print_detailed_results(mutant_test_records: Iterable[Tuple[str, str, str, str]]):
         """Prints detailed mutant/test results."""
         print("\nDetailed Mutant/Test Results:")
         print("+-----+-------------------------+------------------------------+------------------------------+----------+")
@@ -42,3 +93,125 @@ class Reporter:
         for idx, (mutant_file, test_file, result, source_file) in enumerate(mutant_test_records, 1):
             print(f"| {idx:<3} | {os.path.basename(source_file):<23} | {os.path.basename(mutant_file):<28} | {os.path.basename(test_file):<28} | {result:<8} |")
         print("+-----+-------------------------+------------------------------+------------------------------+----------+")
+
+    @staticmethod
+    def _print_killing_cases(killing_cases: Dict[str, Dict[str, List[str]]]):
+        """Prints the test cases that killed each mutant."""
+        print("\nKilling Test Cases:")
+        print("+------------------------------+------------------------------+----------------------------------------+")
+        print("| Mutant                       | Test File                    | Test Case                              |")
+        print("+------------------------------+------------------------------+----------------------------------------+")
+        for mutant, cases in killing_cases.items():
+            for test_file, names in cases.items():
+                for name in names:
+                    print(f"| {mutant:<28} | {os.path.basename(test_file):<28} | {name:<38} |")
+        print("+------------------------------+------------------------------+----------------------------------------+")
+
+    @staticmethod
+    def _print_unreachable(unreachable: List[Tuple[str, str, int]]):
+        """Prints the functions no test binary links in, whose mutants were not built."""
+        print("\nUnreachable Functions (mutants not built):")
+        print("+-------------------------+----------------------------------------+---------+")
+        print("| Source File             | Function                               | Mutants |")
+        print("+-------------------------+----------------------------------------+---------+")
+        for source_file, func_name, count in unreachable:
+            print(f"| {os.path.basename(source_file):<23} | {func_name:<38} | {count:<7} |")
+        print("+-------------------------+----------------------------------------+---------+")
+        print(f"| Total                   |                                        | {sum(c for _, _, c in unreachable):<7} |")
+        print("+-------------------------+----------------------------------------+---------+")
+
+    @staticmethod
+    def _print_kill_matrix(kill_matrix, minimal_tests: List[str]):
+        """Prints the kill matrix size and the minimal test subset that kills the same mutants."""
+        kills = sum(row.bit_count() for row in kill_matrix.killed)
+        print("\nKill Matrix:")
+        print("+---------------------------+--------------+")
+        print(f"| Mutants                   | {len(kill_matrix.mutants):<12} |")
+        print(f"| Tests                     | {len(kill_matrix.tests):<12} |")
+        print(f"| Killing (mutant, test)    | {kills:<12} |")
+        print(f"| Bitset payload (bytes)    | {kill_matrix.memory_bytes():<12} |")
+        print(f"| Minimal test subset       | {len(minimal_tests):<12} |")
+        print("+---------------------------+--------------+")
+        for test_path in minimal_tests:
+            print(f"  {os.path.basename(test_path)}")
+
+    @staticmethod
+    def _print_dominators(dominator_counts: Optional[Dict[str, int]], skipped_subsumed: int):
+        """Prints the dominator analysis of this run and the mutants skipped as subsumed."""
+        print("\nDominator Mutants:")
+        print("+---------------------------+--------------+")
+        if dominator_counts:
+            print(f"| Functions analysed        | {dominator_counts['functions']:<12} |")
+            print(f"| Mutants                   | {dominator_counts['mutants']:<12} |")
+            print(f"| Dominators                | {dominator_counts['dominators']:<12} |")
+            print(f"| Subsumed                  | {dominator_counts['subsumed']:<12} |")
+        print(f"| Skipped as subsumed       | {skipped_subsumed:<12} |")
+        print("+---------------------------+--------------+")
+
+    @staticmethod
+    def _print_selective(stable_categories: int, skipped_mutants: int, saved_executions: float):
+        """Prints how much work selective mutation saved; the executions are estimated from past runs."""
+        print("\nSelective Mutation:")
+        print("+---------------------------+--------------+")
+        print(f"| Stable categories         | {stable_categories:<12} |")
+        print(f"| Mutants not audited       | {skipped_mutants:<12} |")
+        print(f"| Test executions saved (~) | {round(saved_executions):<12} |")
+        print("+---------------------------+--------------+")
+
+    @staticmethod
+    def _print_cache(cache_stats: Dict[str, List[int]]):
+        """Prints the artifact cache hits per entry kind."""
+        print("\nArtifact Cache:")
+        print("+------------+------------+-------------+---------+----------+")
+        print("| Kind       | Local hits | Remote hits | Misses  | Hit rate |")
+        print("+------------+------------+-------------+---------+----------+")
+        for kind, (local_hits, remote_hits, misses) in sorted(cache_stats.items()):
+            lookups = local_hits + remote_hits + misses
+            rate = (local_hits + remote_hits) / lookups * 100 if lookups else 0.0
+            print(f"| {kind:<10} | {local_hits:<10} | {remote_hits:<11} | {misses:<7} | {rate:7.1f}% |")
+        print("+------------+------------+-------------+---------+----------+")
+
+    @staticmethod
+    def _print_resources(records, wall_s: float, cpu_s: float, top: int = 20):
+        """
+        Prints the tests with the highest mean run time, the mutants with the highest peak memory and
+        the CPU time of all child processes against the wall time of the run.
+        :param records: RecordStore whose records carry the build/test resource usage.
+        """
+        tests: Dict[str, List[float]] = {}
+        mutants: Dict[str, int] = {}
+        build_cpu = test_cpu = 0.0
+        for (mutant_file, test_file, _, _), usage in records.with_usage():
+            if usage.test_wall_s:
+                runs = tests.setdefault(test_file, [0, 0.0, 0.0])
+                runs[0] += 1
+                runs[1] += usage.test_wall_s
+                runs[2] = max(runs[2], usage.test_wall_s)
+            mutants[mutant_file] = max(mutants.get(mutant_file, 0), usage.max_rss_kb)
+            build_cpu += usage.build_cpu_s
+            test_cpu += usage.test_cpu_s
+
+        print(f"\nSlowest Tests (top {top} by mean run time):")
+        print("+------------------------------+---------+------------+------------+")
+        print("| Test File                    | Runs    | Mean (s)   | Max (s)    |")
+        print("+------------------------------+---------+------------+------------+")
+        for test_file, (runs, total, longest) in sorted(tests.items(), key=lambda t: t[1][1] / t[1][0], reverse=True)[:top]:
+            print(f"| {os.path.basename(test_file):<28} | {runs:<7} | {total / runs:<10.3f} | {longest:<10.3f} |")
+        print("+------------------------------+---------+------------+------------+")
+
+        print(f"\nPeak-Memory Mutants (top {top}, build or test process):")
+        print("+------------------------------+--------------+")
+        print("| Mutant File                  | Max RSS (MB) |")
+        print("+------------------------------+--------------+")
+        for mutant_file, max_rss_kb in sorted(mutants.items(), key=lambda m: m[1], reverse=True)[:top]:
+            print(f"| {os.path.basename(mutant_file):<28} | {max_rss_kb / 1024:<12.1f} |")
+        print("+------------------------------+--------------+")
+
+        print("\nCPU and Wall Time:")
+        print("+---------------------------+--------------+")
+        print(f"| Wall time (s)             | {wall_s:<12.2f} |")
+        print(f"| Child CPU time (s)        | {cpu_s:<12.2f} |")
+        print(f"|   mutant builds (s)       | {build_cpu:<12.2f} |")
+        print(f"|   mutant tests (s)        | {test_cpu:<12.2f} |")
+        print(f"| CPU / wall                | {cpu_s / wall_s if wall_s else 0:<12.2f} |")
+        print("+---------------------------+--------------+")
@@ -0,0 +1,90 @@
+# result_writers.py
+"""
+Module for machine-readable result files written while the run is in progress.
+
+JsonLinesWriter is a verdict listener that appends one JSON object per mutant as soon as its
+verdict is known and flushes it, so dashboards can ingest partial results of long runs.
+write_junit converts a finished (or partial) JSON Lines file into JUnit XML: one test suite per
+source file, one test case per mutant, and a failure for every surviving mutant.
+"""
+
+import os
+import json
+import time
+import logging
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, TextIO
+
+from mutant_store import MutantVerdict
+
+logger = logging.getLogger(__name__)
+
+class JsonLinesWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[TextIO] = open(path, 'w')
+
+    def __call__(self, verdict: MutantVerdict):
+        self._file.write(json.dumps({
+            'mutant': verdict.name,
+            'id': verdict.mutant_id,
+            'source': verdict.source_path,
+            'function': verdict.function,
+            'line': verdict.line,
+            'column': verdict.column,
+            'old': verdict.old,
+            'new': verdict.new,
+            'status': 'killed' if verdict.killed else 'survived',
+            'killing_tests': verdict.killing_tests,
+            'killing_cases': verdict.killing_cases or {},
+            'abort_lines': verdict.abort_lines or {},
+            'tests': verdict.tests,
+            'time': round(time.time(), 3)
+        }) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def read_json_lines(path: str) -> List[dict]:
+    """Read a results file, ignoring a trailing partial line of a run still in progress."""
+    results = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring incomplete line in {path}.")
+    return results
+
+def write_junit(jsonl_path: str, xml_path: str):
+    """Write JUnit XML from a JSON Lines results file."""
+    suites: Dict[str, List[dict]] = {}
+    for result in read_json_lines(jsonl_path):
+        suites.setdefault(result['source'], []).append(result)
+    root = ET.Element('testsuites', name='UTMuter')
+    for source_path, results in suites.items():
+        survived = sum(r['status'] == 'survived' for r in results)
+        suite = ET.SubElement(root, 'testsuite', name=os.path.basename(source_path),
+                              tests=str(len(results)), failures=str(survived))
+        for result in results:
+            case = ET.SubElement(suite, 'testcase', name=result['mutant'],
+                                 classname=f"{os.path.basename(source_path)}.{result['function']}")
+            if result['status'] == 'survived':
+                ET.SubElement(case, 'failure', message='Mutant survived').text = (
+                    f"{source_path}:{result['line']}:{result['column']} '{result['old']}' -> '{result['new']}' "
+                    f"survived {len(result['tests'])} test(s)"
+                )
+            else:
+                output = []
+                if result.get('killing_cases'):
+                    output.append('Killed by test case(s): ' + ', '.join(
+                        f"{os.path.basename(test)}::{name}" for test, names in result['killing_cases'].items() for name in names
+                    ))
+                output += [f"{os.path.basename(test)} stopped at: {line}" for test, line in result.get('abort_lines', {}).items()]
+                if output:
+                    ET.SubElement(case, 'system-out').text = '\n'.join(output)
+    ET.indent(root)
+    ET.ElementTree(root).write(xml_path, encoding='utf-8', xml_declaration=True)
@@ -0,0 +1,141 @@
+# symbol_index.py
+"""
+Module for selecting tests by static symbol references instead of file names.
+
+Each test file is compiled once and its undefined symbols are read with `nm`. Each source is
+compiled once with -ffunction-sections so that `objdump -r` yields the call graph between its
+functions. A test is selected for a function when it references the function directly, or a
+function that transitively calls it.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import subprocess
+from typing import List, Dict, Set, Optional, Tuple
+
+from builder import Builder
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+RELOCATION_SECTION_PATTERN = re.compile(r'^RELOCATION RECORDS FOR \[(.+)\]:')
+RELOCATION_VALUE_SUFFIX = re.compile(r'[-+]0x[0-9a-fA-F]+$')
+
+def run_binutil(command: List[str]) -> Optional[str]:
+    """Runs an nm/objdump command and returns its stdout, or None if it failed."""
+    logger.debug(f"Symbol command: {' '.join(command)}")
+    try:
+        return subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout.decode()
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.error(f"Command failed: {' '.join(command)}: {e}")
+        return None
+
+def undefined_symbols(object_path: str) -> Set[str]:
+    """Return the undefined (referenced) symbol names of an object file."""
+    output = run_binutil(['nm', '-u', object_path]) or ''
+    return {line.split()[-1] for line in output.splitlines() if line.strip()}
+
+def defined_functions(object_path: str) -> Dict[str, str]:
+    """Return the text symbols defined in an object file, mapped to their demangled names without parameters."""
+    raw = (run_binutil(['nm', '--defined-only', object_path]) or '').splitlines()
+    demangled = (run_binutil(['nm', '--defined-only', '-C', object_path]) or '').splitlines()
+    functions: Dict[str, str] = {}
+    for raw_line, demangled_line in zip(raw, demangled):
+        parts = raw_line.split(None, 2)
+        if len(parts) == 3 and parts[1] in ('T', 't', 'W', 'w'):
+            readable = demangled_line.split(None, 2)[2] if len(demangled_line.split(None, 2)) == 3 else parts[2]
+            functions[parts[2]] = readable.split('(')[0]
+    return functions
+
+def call_graph(object_path: str, functions: Dict[str, str]) -> Dict[str, Set[str]]:
+    """Return caller -> callees between the functions of an object compiled with -ffunction-sections."""
+    output = run_binutil(['objdump', '-r', object_path]) or ''
+    graph: Dict[str, Set[str]] = {name: set() for name in functions}
+    current = None
+    for line in output.splitlines():
+        m = RELOCATION_SECTION_PATTERN.match(line)
+        if m:
+            section = m.group(1)
+            current = section[len('.text.'):] if section.startswith('.text.') else None
+            current = current if current in functions else None
+            continue
+        parts = line.split()
+        if current is None or len(parts) < 3:
+            continue
+        target = RELOCATION_VALUE_SUFFIX.sub('', parts[2])
+        if target.startswith('.text.'):
+            target = target[len('.text.'):]
+        if target in functions and target != current:
+            graph[current].add(target)
+    return graph
+
+class SymbolIndex:
+    """Function -> tests index derived from symbol references, built once per run."""
+
+    def __init__(self):
+        self.tests_by_function: Dict[str, Dict[str, List[str]]] = {}
+
+    @staticmethod
+    def build(source_paths: List[str], test_paths: List[str], objects_dir: str, config=None) -> "SymbolIndex":
+        """Compile every test and source once and index which tests reach which functions."""
+        os.makedirs(objects_dir, exist_ok=True)
+        index = SymbolIndex()
+        test_refs: Dict[str, Set[str]] = {}
+        for test_path in test_paths:
+            if os.path.splitext(test_path)[1] not in ('.c', '.cpp'):
+                continue
+            obj = SymbolIndex._compile(test_path, objects_dir, [], config)
+            if obj is None:
+                logger.warning(f"Test {test_path} could not be compiled; it will not be selected.")
+                continue
+            test_refs[test_path] = undefined_symbols(obj)
+
+        for source_path in source_paths:
+            if os.path.splitext(source_path)[1] not in ('.c', '.cpp'):
+                continue
+            obj = SymbolIndex._compile(source_path, objects_dir, ['-ffunction-sections'], config)
+            if obj is None:
+                continue
+            functions = defined_functions(obj)
+            graph = call_graph(obj, functions)
+            per_function: Dict[str, List[str]] = {}
+            for test_path, refs in test_refs.items():
+                for symbol in SymbolIndex._reachable(refs & set(functions), graph):
+                    per_function.setdefault(functions[symbol], []).append(test_path)
+            index.tests_by_function[os.path.abspath(source_path)] = per_function
+        logger.info(f"Symbol index built from {len(test_refs)} test object(s) and {len(index.tests_by_function)} source object(s).")
+        return index
+
+    @staticmethod
+    def _compile(path: str, objects_dir: str, extra_flags: List[str], config) -> Optional[str]:
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+        object_path = os.path.abspath(os.path.join(objects_dir, f"{base_name}_{key}.o"))
+        project = config.project if config is not None else None
+        if project is not None:
+            ok = Builder.compile_object(os.path.abspath(path), object_path, project.compiler,
+                                        project.flags_for(path) + extra_flags, cwd=project.directory_for(path))
+        else:
+            ok = Builder.compile_object(path, object_path, flags=extra_flags)
+        return object_path if ok else None
+
+    @staticmethod
+    def _reachable(roots: Set[str], graph: Dict[str, Set[str]]) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(roots)
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(graph.get(name, ()))
+        return seen
+
+    def select_tests(self, source_path: str, func_names: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Return the tests reaching any function of the source, and the tests per function."""
+        per_function = self.tests_by_function.get(os.path.abspath(source_path), {})
+        func_tests = {func_name: per_function.get(func_name, []) for func_name in func_names}
+        source_tests = sorted({t for tests in per_function.values() for t in tests})
+        return source_tests, func_tests
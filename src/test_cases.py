@@ -0,0 +1,83 @@
+# test_cases.py
+"""
+Module for running selected test cases of a test binary and reading per-case results.
+
+A test case protocol tells how a test binary is asked to run only some of its cases and how its
+output names the result of each case:
+    {"filter_arg": "--gtest_filter={filter}",       (appended to the command line, optional)
+     "filter_env": "MY_CASE_FILTER",                 (environment variable set to the filter, optional)
+     "filter_format": "*{function}*",                (filter for the mutated function)
+     "result_pattern": "^\\[\\s*(?P<status>OK|FAILED)\\s*\\] (?P<case>[\\w/]+\\.[\\w/]+)",
+     "fail_statuses": ["FAILED"]}
+Built in are 'gtest' (GoogleTest) and 'env', a minimal convention for plain C test binaries: run
+the cases whose name contains $UTMUTER_CASE_FILTER (all cases when unset) and print one
+'PASS <case>' or 'FAIL <case>' line per case. When a filtered run passes without reporting any
+case, the binary is run again without a filter, so tests without matching case names still count.
+"""
+
+import os
+import re
+import json
+import shlex
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Tuple
+
+from constants import *
+
+class CaseProtocol(NamedTuple):
+    name: str
+    filter_arg: Optional[str]
+    filter_env: Optional[str]
+    filter_format: str
+    result_pattern: Pattern
+    fail_statuses: FrozenSet[str]
+
+    @staticmethod
+    def load(name: str) -> "CaseProtocol":
+        """Return a built-in protocol ('gtest', 'env') or one described by a JSON file."""
+        if name in CASE_PROTOCOLS:
+            return CASE_PROTOCOLS[name]
+        with open(name, 'r') as f:
+            spec = json.load(f)
+        return CaseProtocol.from_spec(name, spec)
+
+    @staticmethod
+    def from_spec(name: str, spec: dict) -> "CaseProtocol":
+        pattern = re.compile(spec['result_pattern'], re.MULTILINE)
+        if not {'status', 'case'} <= set(pattern.groupindex):
+            raise ValueError(f"result_pattern of test case protocol {name} needs the named groups 'status' and 'case'")
+        return CaseProtocol(name, spec.get('filter_arg'), spec.get('filter_env'), spec.get('filter_format', '{function}'),
+                            pattern, frozenset(spec.get('fail_statuses', ['FAILED', 'FAIL'])))
+
+    def command(self, test_command: str, function: str) -> Tuple[str, Optional[Dict[str, str]]]:
+        """Return the command line and environment that run only the cases selected for a function."""
+        case_filter = self.filter_format.format(function=function)
+        if self.filter_arg:
+            test_command = f"{test_command} {shlex.quote(self.filter_arg.format(filter=case_filter))}"
+        env = dict(os.environ, **{self.filter_env: case_filter}) if self.filter_env else None
+        return test_command, env
+
+    def parse(self, output: str) -> Dict[str, bool]:
+        """Return whether each case reported in the output passed; a case that failed once counts as failed."""
+        results: Dict[str, bool] = {}
+        for match in self.result_pattern.finditer(output):
+            case = match.group('case')
+            results[case] = results.get(case, True) and match.group('status') not in self.fail_statuses
+        return results
+
+    @staticmethod
+    def failed(results: Dict[str, bool]) -> List[str]:
+        return [case for case, passed in results.items() if not passed]
+
+CASE_PROTOCOLS: Dict[str, CaseProtocol] = {
+    CASES_GTEST: CaseProtocol.from_spec(CASES_GTEST, {
+        'filter_arg': '--gtest_filter={filter}',
+        'filter_format': '*{function}*',
+        'result_pattern': r'^\[\s*(?P<status>OK|FAILED)\s*\] (?P<case>[\w/]+\.[\w/]+)',
+        'fail_statuses': ['FAILED'],
+    }),
+    CASES_ENV: CaseProtocol.from_spec(CASES_ENV, {
+        'filter_env': CASE_FILTER_ENV,
+        'result_pattern': r'^(?P<status>PASS|FAIL)\b:?\s+(?P<case>\S+)',
+        'fail_statuses': ['FAIL'],
+    }),
+}
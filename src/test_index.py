@@ -0,0 +1,95 @@
+# test_index.py
+"""
+Module for matching sources and functions to test files through a tokenized filename index.
+"""
+
+import os
+import re
+import json
+import fnmatch
+import logging
+from typing import List, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SEPARATOR = re.compile(r'[^A-Za-z0-9]+')
+
+class TestIndex:
+    """
+    Index from filename token sequences to test files, built once per run.
+
+    Test file names are split into lower-case tokens at every non-alphanumeric character
+    ('test_Net_Monitor.c' -> test, net, monitor) and every contiguous token sequence is indexed.
+    A source or function matches a test when its own token sequence appears as whole tokens in the
+    test name, so 'Net' matches 'test_Net_Monitor' but not 'test_NetworkMgr'.
+
+    Optional mapping rules (JSON) take precedence over name matching:
+        {"sources": {"<source name or glob>": ["<test glob>", ...]},
+         "functions": {"<function name or glob>": ["<test glob>", ...]}}
+    """
+
+    def __init__(self, test_paths: List[str], rules: Optional[dict] = None):
+        self.test_paths = test_paths
+        self.rules = rules or {}
+        self._by_key: Dict[str, List[str]] = {}
+        for test_path in test_paths:
+            tokens = TestIndex.tokenize(os.path.splitext(os.path.basename(test_path))[0])
+            keys: Set[str] = {
+                '_'.join(tokens[i:j]) for i in range(len(tokens)) for j in range(i + 1, len(tokens) + 1)
+            }
+            for key in keys:
+                self._by_key.setdefault(key, []).append(test_path)
+
+    @staticmethod
+    def tokenize(name: str) -> List[str]:
+        """Split a file or function name into lower-case alphanumeric tokens."""
+        return [token for token in TOKEN_SEPARATOR.split(name.lower()) if token]
+
+    @staticmethod
+    def load_rules(path: str) -> dict:
+        """Load explicit source/function to test mapping rules from a JSON file."""
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _lookup(self, name: str) -> List[str]:
+        return self._by_key.get('_'.join(TestIndex.tokenize(name)), [])
+
+    def _apply_rules(self, section: str, name: str, path: Optional[str] = None) -> Optional[List[str]]:
+        """Return the tests selected by the first matching rule of a section, or None if no rule applies."""
+        for pattern, test_globs in self.rules.get(section, {}).items():
+            if fnmatch.fnmatch(name, pattern) or (path is not None and fnmatch.fnmatch(path, pattern)):
+                return [
+                    t for t in self.test_paths
+                    if any(fnmatch.fnmatch(os.path.basename(t), g) or fnmatch.fnmatch(t, g) for g in test_globs)
+                ]
+        return None
+
+    def tests_for_source(self, source_path: str) -> List[str]:
+        """Return the test files matching a source file."""
+        base_name = os.path.splitext(os.path.basename(source_path))[0]
+        ruled = self._apply_rules('sources', base_name, os.path.abspath(source_path))
+        return ruled if ruled is not None else self._lookup(base_name)
+
+    def tests_for_function(self, func_name: str, source_tests: List[str]) -> List[str]:
+        """Return the tests among a source's matching tests that are relevant for one of its functions."""
+        ruled = self._apply_rules('functions', func_name)
+        if ruled is not None:
+            return ruled
+        named = set(self._lookup(func_name))
+        return [t for t in source_tests if t in named]
+
+    def select_tests(self, source_path: str, func_names: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Return the tests matching the source, and the relevant tests per function."""
+        source_tests = self.tests_for_source(source_path)
+        if not source_tests:
+            return source_tests, {}
+        return source_tests, {func_name: self.tests_for_function(func_name, source_tests) for func_name in func_names}
+
+    @staticmethod
+    def log_mapping(source_path: str, source_tests: List[str], func_tests: Dict[str, List[str]]):
+        """Log all match decisions for a source in a single message."""
+        lines = [f"Test mapping for {source_path}: {len(source_tests)} matching test file(s)"]
+        for func_name, tests in func_tests.items():
+            names = ', '.join(os.path.basename(t) for t in tests) if tests else '(no tests, skipped)'
+            lines.append(f"  {func_name} -> {names}")
+        logger.info('\n'.join(lines))
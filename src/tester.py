@@ -2,22 +2,87 @@
 """
 Module for running unit tests on compiled binaries.
 """
-import subprocess
+import shutil
 import logging
+from typing import List, NamedTuple, Optional, Pattern
+
+from tracing import span
+from process_usage import run_process, run_process_until
 
 logger = logging.getLogger(__name__)
 
+class TestRun(NamedTuple):
+    """The outcome of one test binary run."""
+    passed: bool
+    failed_cases: List[str] = []
+    # The output line that matched the abort pattern, if the run was cut short
+    abort_line: Optional[str] = None
+
 class Tester:
     @staticmethod
     def run_tests(test_command: str) -> bool:
         """Runs the provided test command and returns True if tests pass."""
         logger.debug(f"Running test command: {test_command}")
-        try:
-            # If test_command is just the path to an executable, shell=True is not strictly needed.
-            # If it might contain arguments, passing as a list is safer:
-            # e.g., subprocess.check_call([test_command, arg1, arg2], ...)
-            subprocess.check_call(test_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.debug(f"Test command '{test_command}' failed. Exit code: {e.returncode}. Stderr: {e.stderr.decode() if e.stderr else 'N/A'}")
+        # If test_command is just the path to an executable, shell=True is not strictly needed.
+        # If it might contain arguments, passing as a list is safer.
+        with span('run_tests', command=test_command):
+            returncode, _, stderr, _ = run_process(test_command, shell=True)
+        if returncode != 0:
+            logger.debug(f"Test command '{test_command}' failed. Exit code: {returncode}. Stderr: {stderr.decode() or 'N/A'}")
             return False
+        return True
+
+    @staticmethod
+    def line_buffered(test_command: str) -> str:
+        """Prefix the command with 'stdbuf -oL -eL' when available, so a test's output is seen as it is printed."""
+        return f"stdbuf -oL -eL {test_command}" if shutil.which('stdbuf') else test_command
+
+    @staticmethod
+    def _run(command: str, abort_pattern: Optional[Pattern], env=None):
+        """Run a test command; with an abort pattern, stop it at the first matching output line."""
+        if abort_pattern is None:
+            return run_process(command, shell=True, env=env) + (None,)
+        return run_process_until(Tester.line_buffered(command), abort_pattern, shell=True, env=env)
+
+    @staticmethod
+    def run_tests_until(test_command: str, abort_pattern: Pattern) -> TestRun:
+        """
+        Runs the test command while matching its output against a failure pattern. The test is killed
+        at the first matching line and counts as failed.
+        """
+        logger.debug(f"Running test command: {test_command}")
+        with span('run_tests', command=test_command):
+            returncode, _, stderr, _, abort_line = Tester._run(test_command, abort_pattern)
+        if abort_line is not None:
+            logger.debug(f"Test command '{test_command}' stopped at failure output: {abort_line}")
+            return TestRun(False, [], abort_line)
+        if returncode != 0:
+            logger.debug(f"Test command '{test_command}' failed. Exit code: {returncode}. Stderr: {stderr.decode() or 'N/A'}")
+            return TestRun(False)
+        return TestRun(True)
+
+    @staticmethod
+    def run_test_cases(test_command: str, protocol, function: str, abort_pattern: Optional[Pattern] = None) -> TestRun:
+        """
+        Runs only the test cases selected for a function, using a test case protocol (see test_cases.py).
+        If the filtered run passes without reporting any case (the filter selected none), all cases are run;
+        a failed run counts as it is. With an abort pattern, the run stops at the first matching output
+        line; the cases reported up to then are kept.
+        """
+        command, env = protocol.command(test_command, function)
+        logger.debug(f"Running test command: {command}")
+        with span('run_tests', command=command, function=function):
+            returncode, stdout, stderr, _, abort_line = Tester._run(command, abort_pattern, env)
+        results = protocol.parse(stdout.decode(errors='replace'))
+        if not results and returncode == 0 and abort_line is None:
+            logger.debug(f"No test case of '{test_command}' selected for '{function}'. Running all cases.")
+            with span('run_tests', command=test_command):
+                returncode, stdout, stderr, _, abort_line = Tester._run(test_command, abort_pattern)
+            results = protocol.parse(stdout.decode(errors='replace'))
+        failed_cases = protocol.failed(results)
+        if returncode != 0 or failed_cases or abort_line is not None:
+            logger.debug(f"Test command '{command}' failed. Exit code: {returncode}. Failed cases: "
+                         f"{', '.join(failed_cases) or 'N/A'}. Abort line: {abort_line or 'N/A'}. "
+                         f"Stderr: {stderr.decode() or 'N/A'}")
+            return TestRun(False, failed_cases, abort_line)
+        return TestRun(True)
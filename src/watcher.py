@@ -0,0 +1,172 @@
+# watcher.py
+"""
+Module for watch mode: re-run the mutants of changed functions whenever a watched file is saved.
+
+The source and test folders are walked again on every poll, so new and deleted files are picked
+up, and the files are polled for modification times. The per-function fingerprints, the project
+object cache and the verdicts of every function stay in memory between cycles, so a save only
+costs the builds and test runs of the mutants in the functions whose text changed, or whose
+selected tests changed. The test selection (and the symbol index, whose call graph depends on the
+sources) is rebuilt whenever a test, or with symbol selection a source, is added, removed or saved.
+"""
+
+import os
+import time
+import logging
+from typing import Dict, List, Set, Tuple
+
+from parser import Parser
+from mutator import Mutator
+from mutant_store import MutantVerdict
+from dominators import function_key
+from constants import *
+
+logger = logging.getLogger(__name__)
+
+class Watcher:
+    def __init__(self, tester, interval: float = DEFAULT_WATCH_INTERVAL):
+        """
+        :param tester: A MutationTester whose sources, tests, mutants directory and config are watched.
+        :param interval: Seconds between two polls of the watched files.
+        """
+        self.tester = tester
+        self.config = tester.config
+        self.interval = interval
+        self.mtimes: Dict[str, float] = {}
+        self.fingerprints: Dict[str, Dict[str, str]] = {}
+        self.verdicts: Dict[str, Dict[str, bool]] = {}
+        self.config.verdict_listeners.append(self.on_verdict)
+
+    def run(self):
+        try:
+            self._run()
+        except KeyboardInterrupt:
+            self.config.progress.print_line("\nWatch mode stopped.")
+        finally:
+            self.config.kill_stats.commit_run()
+            self.config.kill_stats.save(self.config.kill_stats_path)
+            self.config.cleanup()
+
+    def _run(self):
+        if not self.tester.collect_files():
+            return
+        self.config.operator_set = Mutator.load_operator_set(self.config.operators)
+        self.mtimes = self._poll()
+        self.config.progress.print_line(f"Watching {len(self.tester.source_paths)} source file(s) and "
+                                        f"{len(self.tester.test_paths)} test file(s). Press Ctrl+C to stop.")
+        self._run_cycle({path: None for path in self.tester.source_paths})
+        while True:
+            time.sleep(self.interval)
+            removed = self._refresh_paths()
+            mtimes = self._poll()
+            changed = [path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime]
+            self.mtimes = mtimes
+            if changed or removed:
+                self._run_cycle(self._functions_to_run(changed, removed))
+
+    def _refresh_paths(self) -> List[str]:
+        """Walk the watched folders again; return the files that are gone (new files show up as changed)."""
+        source_paths, test_paths = self.tester.collect_paths()
+        current = set(source_paths) | set(test_paths)
+        removed = [path for path in self.tester.source_paths + self.tester.test_paths if path not in current]
+        self.tester.source_paths, self.tester.test_paths = source_paths, test_paths
+        return removed
+
+    def _poll(self) -> Dict[str, float]:
+        mtimes = {}
+        for path in self.tester.source_paths + self.tester.test_paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                continue
+        return mtimes
+
+    def _selection(self) -> Dict[str, Dict[str, List[str]]]:
+        """Return the tests currently selected for each function of every known source."""
+        selector = self.config.symbol_index or self.config.test_index
+        return {source_path: selector.select_tests(source_path, list(fingerprints))[1]
+                for source_path, fingerprints in self.fingerprints.items()}
+
+    def _functions_to_run(self, changed_paths: List[str], removed_paths: List[str]) -> Dict[str, Set[str]]:
+        """Return, per source, the functions whose mutants must run again after the given files changed."""
+        changed_tests = [path for path in changed_paths if path in self.tester.test_paths]
+        changed_sources = [path for path in changed_paths if path in self.tester.source_paths]
+        removed_sources = [path for path in removed_paths if path in self.fingerprints]
+        removed_tests = [path for path in removed_paths if path not in self.fingerprints]
+        if self.config.artifact_cache is not None:
+            for path in changed_paths + removed_paths:
+                self.config.artifact_cache.forget(path)
+        for source_path in removed_sources:
+            for func_name in self.fingerprints.pop(source_path):
+                self.verdicts.pop(function_key(source_path, func_name), None)
+        to_run: Dict[str, Set[str]] = {}
+        if self.config.object_cache is not None:
+            for test_path in changed_tests:
+                self.config.object_cache.invalidate(test_path)
+        sources_changed = (changed_sources or removed_sources) and self.config.symbol_index is not None
+        if changed_tests or removed_tests or sources_changed:
+            previous = self._selection()
+            self.tester.build_test_selection()
+            current = self._selection()
+            for source_path, fingerprints in self.fingerprints.items():
+                before, after = previous.get(source_path, {}), current.get(source_path, {})
+                functions = {f for f in fingerprints
+                             if any(t in changed_tests for t in after.get(f, [])) or
+                             set(after.get(f, [])) != set(before.get(f, []))}
+                if functions:
+                    to_run[source_path] = functions
+        for source_path in changed_sources:
+            if self.config.object_cache is not None:
+                self.config.object_cache.invalidate(source_path)
+            _, fingerprints = self._read_source(source_path)
+            previous = self.fingerprints.get(source_path, {})
+            changed = {f for f, h in fingerprints.items() if previous.get(f) != h}
+            for func_name in set(previous) - set(fingerprints):
+                self.verdicts.pop(function_key(source_path, func_name), None)
+            if changed:
+                to_run.setdefault(source_path, set()).update(changed)
+        return to_run
+
+    def _read_source(self, source_path: str) -> Tuple[str, Dict[str, str]]:
+        """Return the source text and the fingerprint of each of its functions with mutation points."""
+        with open(source_path, 'r', newline='') as f:
+            source_code = f.read()
+        source_lines = source_code.splitlines()
+        points = Parser.find_mutation_points(source_code)
+        fingerprints = {
+            func_name: Parser.function_fingerprint(source_lines, func_points[0][0])[1]
+            for func_name, func_points in Parser.group_mutation_points_by_function(points, source_lines).items()
+        }
+        return source_code, fingerprints
+
+    def _run_cycle(self, to_run: Dict[str, Set[str]]):
+        """Run the mutants of the given functions per source (None runs all functions) and print the totals."""
+        if not to_run:
+            return
+        start = time.perf_counter()
+        functions_run = 0
+        for source_path, functions in to_run.items():
+            source_code, fingerprints = self._read_source(source_path)
+            self.fingerprints[source_path] = fingerprints
+            points = Parser.find_mutation_points(source_code)
+            if not points:
+                continue
+            for func_name in functions if functions is not None else fingerprints:
+                self.verdicts.pop(function_key(source_path, func_name), None)
+            functions_run += len(functions) if functions is not None else len(fingerprints)
+            Mutator.process_mutants_for_source(source_path, source_code, points, self.tester.test_paths,
+                                               self.tester.mutants_dir, self.config, functions)
+        if self.config.mutant_index is not None:
+            self.config.mutant_index.flush()
+        total = sum(len(v) for v in self.verdicts.values())
+        killed = sum(sum(v.values()) for v in self.verdicts.values())
+        score = f"{killed / total * 100:.1f}%" if total else "N/A"
+        self.config.progress.print_line(f"[watch] Re-ran {functions_run} function(s) in {time.perf_counter() - start:.2f} s. "
+                                        f"Current score: {killed}/{total} killed ({score}).")
+
+    def on_verdict(self, verdict: MutantVerdict):
+        """Stream each verdict as it arrives and keep it as the current state of its function."""
+        self.verdicts.setdefault(function_key(verdict.source_path, verdict.function), {})[verdict.mutant_id] = verdict.killed
+        status = "KILLED  " if verdict.killed else "SURVIVED"
+        self.config.progress.print_line(f"[watch] {status} {os.path.basename(verdict.source_path)}:{verdict.line}:"
+                                        f"{verdict.column} {verdict.function}: '{verdict.old}' -> '{verdict.new}'")